@@ -10,20 +10,24 @@ def certify_top_m(ranked_candidates: List[Dict], N: int, m: int = 20) -> List[Di
     """
     Evaluate top-m candidates for divisibility.
     """
+    top = ranked_candidates[:m]
+    ds = [int(entry["n"]) for entry in top]
+    mods = [N % d for d in ds]
+    # gcd(N, d) == gcd(d, N mod d): reuse the residue instead of a second 127-bit reduction.
+    gcds = [math.gcd(d, mod) for d, mod in zip(ds, mods)]
     results = []
-    for idx, entry in enumerate(ranked_candidates[:m]):
-        d = int(entry["n"])
-        mod = N % d
-        g = math.gcd(N, d)
-        is_factor = mod == 0
+    for idx, (entry, d, mod, g) in enumerate(zip(top, ds, mods, gcds)):
+        energy = entry["energy"]
+        if not isinstance(energy, float):
+            raise TypeError(f"Candidate energy must be a float, got {type(energy).__name__}")
         results.append(
             {
                 "rank": idx + 1,
                 "n": d,
-                "energy": entry["energy"],
+                "energy": energy,
                 "mod": mod,
                 "gcd": g,
-                "is_factor": is_factor,
+                "is_factor": mod == 0,
             }
         )
     return results
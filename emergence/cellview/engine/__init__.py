@@ -1,3 +1,3 @@
-from .engine import Cell, CellViewEngine
+from .engine import Cell, CellViewEngine, EnergyCache
 
-__all__ = ["Cell", "CellViewEngine"]
+__all__ = ["Cell", "CellViewEngine", "EnergyCache"]
@@ -1,18 +1,68 @@
-from dataclasses import dataclass
-from typing import Dict, List, Optional, Sequence, Tuple
+import threading
+from dataclasses import dataclass, replace
+from math import isqrt
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
-from decimal import Decimal
-
-from cellview.heuristics.core import EnergySpec, resolve_energy, default_specs
+from cellview.engine import kernels
+from cellview.heuristics.core import EnergySpec, default_specs, evaluate_batch, resolve_energy
 from cellview.metrics.core import aggregation, detect_dg, sortedness
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Cell:
     n: int
     algotype: str
     frozen: bool = False
-    energy: Optional[Decimal] = None  # position-independent
+    energy: Optional[float] = None  # position-independent
+
+
+def _freeze(value: Any) -> Any:
+    """Hashable stand-in for spec params (nested dicts/lists become tuples)."""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+class EnergyCache:
+    """
+    Energies shared between engines that are handed the same instance.
+
+    Maps (N, fn, frozen params) -> {n: energy}. A spec's energy is a pure
+    function of (n, N, params), so engines re-created over the same N (repeat
+    runs) only evaluate candidates no earlier engine has seen. Changing a
+    spec's fn or params changes its key, so stale entries are never read.
+    Nothing is evicted: the caller owns the cache and decides its lifetime.
+    """
+
+    def __init__(self):
+        self._tables: Dict[tuple, Dict[int, float]] = {}
+        self._lock = threading.Lock()
+
+    def table(self, N: int, spec: EnergySpec) -> Optional[Dict[int, float]]:
+        """The {n: energy} table for spec over N, or None if params are unhashable."""
+        try:
+            key = (N, spec.fn, _freeze(spec.params))
+            hash(key)
+        except TypeError:
+            return None
+        with self._lock:
+            return self._tables.setdefault(key, {})
+
+    def update(self, table: Dict[int, float], ns: Sequence[int], values: Sequence[float]) -> None:
+        with self._lock:
+            table.update(zip(ns, values))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tables.clear()
+
+    def retain_only(self, N: int) -> None:
+        """Drop every table computed for a modulus other than N."""
+        with self._lock:
+            for key in [key for key in self._tables if key[0] != N]:
+                del self._tables[key]
 
 
 class CellViewEngine:
@@ -26,6 +76,7 @@ class CellViewEngine:
         sweep_order: str = "ascending",
         max_steps: int = 50,
         type2_immovable: bool = False,
+        shared_energies: Optional[EnergyCache] = None,
     ):
         self.N = N
         self.rng = rng
@@ -33,64 +84,141 @@ class CellViewEngine:
         self.max_steps = max_steps
         self.type2_immovable = type2_immovable
         self.energy_specs = energy_specs or default_specs()
-        # cache keyed by (algotype, n) to support multiple energy families
-        self.energy_cache: Dict[tuple, Decimal] = {}
-        # Assign algotypes deterministically via cycle
-        self.cells: List[Cell] = []
+        self.sqrt_n = isqrt(N)
+        # Per-engine view of energy_specs with N-dependent params filled in.
+        self._resolved_specs: Dict[str, EnergySpec] = {}
+        # Per-engine cache for energy_of, keyed by (algotype, n) to support
+        # multiple energy families.
+        self.energy_cache: Dict[tuple, float] = {}
+        # Opt-in cache shared with other engines (see EnergyCache).
+        self.shared_energies = shared_energies
+        # Per-cell state is kept as parallel arrays indexed by cell id
+        # (construction order); _perm maps lattice position -> cell id. Cell
+        # objects are only materialized on demand (see cells).
         algotypes = list(algotypes)
         if not algotypes:
             algotypes = ["dirichlet5"]
-        for idx, val in enumerate(candidates):
-            algo = algotypes[idx % len(algotypes)]
-            self.cells.append(Cell(n=val, algotype=algo, frozen=False, energy=None))
+        # Assign algotypes deterministically via cycle.
+        self._ns: List[int] = list(candidates)
+        self._algotypes: List[str] = [algotypes[idx % len(algotypes)] for idx in range(len(self._ns))]
+        # Sweep buffers (NumPy arrays when numba is available, lists otherwise).
+        # Energies are position-aligned and swapped alongside _perm.
+        self._perm = kernels.index_buffer(range(len(self._ns)))
+        self._energies = kernels.float_buffer(self.precompute_energies())
+        self._frozen = kernels.bool_buffer([False] * len(self._ns))
+        self._any_frozen = False
+        # Pairs the next ascending pass must visit (see step()).
+        self._pair_bound = max(len(self._ns) - 1, 0)
+        self._idx_buffer: List[int] = []
+        # Preallocated sweep orders handed to the kernel: an identity that
+        # ascending passes slice, and a buffer random orders are copied into.
+        self._ascending_order = kernels.index_buffer(range(self._pair_bound))
+        self._order_buffer = kernels.index_buffer(range(self._pair_bound))
+        # Order/equality keys for sortedness and aggregation, indexed by cell id.
+        self._n_keys = kernels.key_buffer(self._ns)
+        self._algo_keys = kernels.key_buffer(self._algotypes)
+
+    @property
+    def cells(self) -> List[Cell]:
+        """
+        Snapshot of the cells in current lattice order. Cells are immutable
+        (assigning to a field raises FrozenInstanceError); freeze(positions) is
+        the only supported way to change engine state.
+        """
+        perm = kernels.to_list(self._perm)
+        frozen = kernels.to_list(self._frozen)
+        return [
+            Cell(n=self._ns[k], algotype=self._algotypes[k], frozen=bool(frozen[k]), energy=e)
+            for k, e in zip(perm, kernels.to_list(self._energies))
+        ]
+
+    def freeze(self, positions: Iterable[int], frozen: bool = True) -> None:
+        """Set the frozen flag of the cells currently at the given lattice positions."""
+        for pos in positions:
+            self._frozen[self._perm[pos]] = frozen
+        self._any_frozen = bool(any(kernels.to_list(self._frozen)))
+        self._pair_bound = max(len(self._ns) - 1, 0)
 
     # --- energy helpers ---
-    def energy_of(self, cell: Cell) -> Decimal:
+    def _spec_for(self, algotype: str) -> EnergySpec:
+        spec = self._resolved_specs.get(algotype)
+        if spec is not None:
+            return spec
+        spec = self.energy_specs.get(algotype)
+        if spec is None:
+            # fallback: try registry by name
+            fn = resolve_energy(algotype)
+            spec = EnergySpec(algotype, fn, {})
+            self.energy_specs[algotype] = spec
+        if "sqrtN" not in spec.params:
+            # Spec params are shared (see default_specs), so bind this engine's
+            # sqrt(N) on a private copy instead of letting every call recompute it.
+            spec = replace(spec, params={**spec.params, "sqrtN": self.sqrt_n})
+        self._resolved_specs[algotype] = spec
+        return spec
+
+    def precompute_energies(self) -> List[float]:
+        """
+        Energies indexed by cell id, with one batched call per algotype (over
+        just the candidates missing from shared_energies, when one is given).
+        """
+        groups: Dict[str, List[int]] = {}
+        for k, algotype in enumerate(self._algotypes):
+            groups.setdefault(algotype, []).append(k)
+        energies: List[float] = [0.0] * len(self._ns)
+        for algotype, ids in groups.items():
+            spec = self._spec_for(algotype)
+            cache = self.shared_energies
+            table = cache.table(self.N, spec) if cache is not None else None
+            if table is None:
+                values = evaluate_batch(spec, [self._ns[k] for k in ids], self.N)
+                for k, value in zip(ids, values):
+                    energies[k] = value
+                continue
+            missing = list(dict.fromkeys(n for n in (self._ns[k] for k in ids) if n not in table))
+            if missing:
+                values = evaluate_batch(spec, missing, self.N)
+                cache.update(table, missing, values)
+            for k in ids:
+                energies[k] = table[self._ns[k]]
+        return energies
+
+    def energy_of(self, cell: Cell) -> float:
         if cell.energy is not None:
             return cell.energy
         cache_key = (cell.algotype, cell.n)
         if cache_key in self.energy_cache:
-            cell.energy = self.energy_cache[cache_key]
-            return cell.energy
-        spec = self.energy_specs.get(cell.algotype)
-        if spec is None:
-            # fallback: try registry by name
-            fn = resolve_energy(cell.algotype)
-            spec = EnergySpec(cell.algotype, fn, {})
-            self.energy_specs[cell.algotype] = spec
+            return self.energy_cache[cache_key]
+        spec = self._spec_for(cell.algotype)
         value = spec.fn(cell.n, self.N, spec.params)
         self.energy_cache[cache_key] = value
-        cell.energy = value
         return value
 
     # --- dynamics ---
-    def sweep_indices(self, length: int) -> List[int]:
+    def sweep_indices(self, length: int) -> Sequence[int]:
         if self.sweep_order == "random":
-            idxs = list(range(length - 1))
+            # Reuse one buffer across steps. It is reset to the identity before
+            # shuffling so the permutation drawn from rng matches a fresh list.
+            # The shuffle itself stays on a list (stdlib rng, so both paths draw
+            # the same permutation) and is then copied into the index buffer.
+            idxs = self._idx_buffer
+            idxs[:] = range(length - 1)
             self.rng.shuffle(idxs)
-            return idxs
-        return list(range(length - 1))
+            return kernels.load_order(self._order_buffer, idxs)
+        return kernels.order_prefix(self._ascending_order, length - 1)
 
     def step(self) -> int:
-        swaps = 0
-        idxs = self.sweep_indices(len(self.cells))
-        for i in idxs:
-            a = self.cells[i]
-            b = self.cells[i + 1]
-            # Type-2: immovable if frozen flag set
-            if self.type2_immovable and (a.frozen or b.frozen):
-                continue
-            # Type-1: frozen cannot initiate swap, but may be moved by neighbor
-            if a.frozen and b.frozen:
-                continue
-
-            e_left = self.energy_of(a)
-            e_right = self.energy_of(b)
-            if e_left > e_right:
-                # only allow if right is not frozen (it must "move into" lower energy slot)
-                if not b.frozen:
-                    self.cells[i], self.cells[i + 1] = self.cells[i + 1], self.cells[i]
-                    swaps += 1
+        # Classic bubble-sort bound: without frozen cells, an ascending pass leaves
+        # everything past its last swap in final position, so the next pass can
+        # stop there. Frozen cells break that invariant, so they disable the bound.
+        bounded = self.sweep_order == "ascending" and not self._any_frozen
+        length = self._pair_bound + 1 if bounded else len(self._ns)
+        idxs = self.sweep_indices(length)
+        swaps, last_swap = kernels.run_sweep(
+            idxs, self._energies, self._frozen, self._perm, self.type2_immovable
+        )
+        if bounded:
+            self._pair_bound = last_swap + 1
         return swaps
 
     def run(self) -> Dict:
@@ -101,18 +229,19 @@ class CellViewEngine:
         for _ in range(self.max_steps):
             swaps = self.step()
             swaps_per_step.append(swaps)
-            sortedness_series.append(sortedness([c.n for c in self.cells]))
-            aggregation_series.append(aggregation([c.algotype for c in self.cells]))
+            sortedness_series.append(sortedness(kernels.gather(self._n_keys, self._perm)))
+            aggregation_series.append(aggregation(kernels.gather(self._algo_keys, self._perm)))
             if swaps == 0:
                 break
 
         dg_episodes, dg_index = detect_dg(sortedness_series)
         final_state = [
-            {"index": idx, "n": c.n, "algotype": c.algotype, "energy": str(self.energy_of(c))}
-            for idx, c in enumerate(self.cells)
+            {"index": idx, "n": self._ns[k], "algotype": self._algotypes[k], "energy": e}
+            for idx, (k, e) in enumerate(zip(kernels.to_list(self._perm), kernels.to_list(self._energies)))
         ]
 
-        ranked_candidates = sorted(final_state, key=lambda x: Decimal(x["energy"]))
+        # final_state is position-aligned with _energies; the ranking reuses its dicts.
+        ranked_candidates = [final_state[i] for i in kernels.argsort(self._energies)]
 
         return {
             "swaps_per_step": swaps_per_step,
@@ -125,4 +254,4 @@ class CellViewEngine:
         }
 
 
-__all__ = ["Cell", "CellViewEngine"]
+__all__ = ["Cell", "CellViewEngine", "EnergyCache"]
@@ -0,0 +1,138 @@
+"""
+Sweep kernel for the cell-view engine.
+
+The bubble-like pass is written once in plain Python over index-addressable
+buffers. When numba is importable the same function is compiled with @njit and
+fed NumPy arrays; otherwise it runs as-is on lists. Both paths perform the
+identical sequence of comparisons and swaps, so results do not depend on
+whether the accelerator is installed.
+"""
+
+from typing import List, Sequence, Tuple
+
+try:
+    import numpy as np
+    from numba import njit
+except ImportError:  # optional accelerator
+    np = None
+    njit = None
+
+NUMBA_AVAILABLE = njit is not None
+
+
+def sweep_pass(order, energies, frozen, perm, type2_immovable) -> Tuple[int, int]:
+    """
+    One sweep over adjacent position pairs (i, i+1) in the given order.
+
+    energies is position-aligned and swapped alongside perm (position -> cell id);
+    frozen is indexed by cell id so the flag travels with its cell.
+    Returns (swaps, index of the last pair swapped or -1).
+    """
+    swaps = 0
+    last_swap = -1
+    for i in order:
+        a = perm[i]
+        b = perm[i + 1]
+        e_left = energies[i]
+        e_right = energies[i + 1]
+        # Type-1: the right cell must not be frozen (it "moves into" the lower
+        # energy slot); a frozen left cell may still be displaced.
+        # Type-2: a frozen cell never moves, so a frozen left cell blocks too.
+        do_swap = (e_left > e_right) & (not frozen[b]) & (not (type2_immovable & frozen[a]))
+        if do_swap:
+            perm[i] = b
+            perm[i + 1] = a
+            energies[i] = e_right
+            energies[i + 1] = e_left
+            swaps += 1
+            last_swap = i
+    return swaps, last_swap
+
+
+if NUMBA_AVAILABLE:
+    _sweep_pass_jit = njit(cache=True)(sweep_pass)
+
+
+def float_buffer(values: Sequence[float]):
+    # Coerce on both paths: energy functions may return ints, which the NumPy
+    # buffer turns into float64 anyway.
+    if NUMBA_AVAILABLE:
+        return np.asarray(values, dtype=np.float64)
+    return [float(v) for v in values]
+
+
+def bool_buffer(values: Sequence[bool]):
+    return np.asarray(values, dtype=np.bool_) if NUMBA_AVAILABLE else list(values)
+
+
+def index_buffer(values: Sequence[int]):
+    if not NUMBA_AVAILABLE:
+        return list(values)
+    if isinstance(values, range):
+        return np.arange(values.start, values.stop, values.step, dtype=np.int64)
+    return np.asarray(values, dtype=np.int64)
+
+
+def order_prefix(identity, count: int) -> Sequence[int]:
+    """The first count positions of an identity index_buffer, without copying."""
+    return identity[:count] if NUMBA_AVAILABLE else range(count)
+
+
+def load_order(buf, order: List[int]) -> Sequence[int]:
+    """
+    order copied into the front of the preallocated index_buffer buf; the
+    filled prefix is returned. Lists are used as-is without numba.
+    """
+    if not NUMBA_AVAILABLE:
+        return order
+    count = len(order)
+    buf[:count] = order
+    return buf[:count]
+
+
+def key_buffer(values: Sequence) -> object:
+    """
+    Per-cell comparison keys for the lattice metrics.
+
+    With NumPy, values are replaced by their dense rank so that 127-bit ints and
+    algotype strings become int64 while preserving both < and ==.
+    """
+    if not NUMBA_AVAILABLE:
+        return list(values)
+    rank = {v: i for i, v in enumerate(sorted(set(values)))}
+    return np.asarray([rank[v] for v in values], dtype=np.int64)
+
+
+def gather(buf, perm):
+    """buf reordered into lattice positions (buf[perm])."""
+    if NUMBA_AVAILABLE:
+        return buf[perm]
+    return [buf[k] for k in perm]
+
+
+def to_list(buf) -> List:
+    return buf.tolist() if NUMBA_AVAILABLE else buf
+
+
+def argsort(buf) -> List[int]:
+    """Stable ascending argsort; ties keep position order, matching sorted()."""
+    if NUMBA_AVAILABLE:
+        return np.argsort(buf, kind="stable").tolist()
+    return sorted(range(len(buf)), key=buf.__getitem__)
+
+
+def run_sweep(order: Sequence[int], energies, frozen, perm, type2_immovable: bool) -> Tuple[int, int]:
+    """
+    Run sweep_pass on buffers created by the *_buffer helpers above. order
+    should come from order_prefix or load_order; other sequences are converted
+    (one allocation per call).
+    """
+    if NUMBA_AVAILABLE:
+        if not isinstance(order, np.ndarray):
+            order = index_buffer(order)
+        swaps, last_swap = _sweep_pass_jit(order, energies, frozen, perm, type2_immovable)
+        return int(swaps), int(last_swap)
+    return sweep_pass(order, energies, frozen, perm, type2_immovable)
+
+
+__all__ = ["NUMBA_AVAILABLE", "sweep_pass", "run_sweep"]
@@ -7,17 +7,24 @@ and the top-ranked candidate energy.
 
 from itertools import product
 
-from cellview.engine.engine import CellViewEngine
+from cellview.engine.engine import CellViewEngine, EnergyCache
+from cellview.experiments.parallel import map_cases, parse_workers
 from cellview.heuristics.core import default_specs, EnergySpec
 from cellview.utils import candidates as cand_utils
 from cellview.utils.challenge import CHALLENGE
 from cellview.utils.rng import rng_from_hex
 
 
+# Per-process energies; every run is over CHALLENGE.n, so overlapping corridors
+# reuse the candidates earlier runs already scored.
+_ENERGIES = EnergyCache()
+
+
 def run_once(window: int, algotype: str, samples: int = 20000):
     rng = rng_from_hex()
     cands = cand_utils.corridor_around_sqrt(CHALLENGE.n, rng, samples=samples, window=window)
     specs = default_specs()
+    _ENERGIES.retain_only(CHALLENGE.n)
     engine = CellViewEngine(
         N=CHALLENGE.n,
         candidates=cands,
@@ -26,6 +33,7 @@ def run_once(window: int, algotype: str, samples: int = 20000):
         rng=rng,
         sweep_order="ascending",
         max_steps=30,
+        shared_energies=_ENERGIES,
     )
     res = engine.run()
     ranked = res["ranked_candidates"]
@@ -43,11 +51,14 @@ def run_once(window: int, algotype: str, samples: int = 20000):
 
 
 def main():
+    workers = parse_workers("Challenge grid probe over corridor widths and energies.")
     windows = [500_000, 1_000_000, 5_000_000]
     algotypes = ["dirichlet11", "combo_dir11_arctan", "combo_dir11_res"]
+    grid = list(product(windows, algotypes))
     print("Challenge grid probe (20k samples per run, deterministic seed):")
-    for window, algo in product(windows, algotypes):
-        out = run_once(window, algo, samples=20_000)
+    # Runs are independent and seed their own RNG; map_cases keeps grid order.
+    outs = map_cases(run_once, [w for w, _ in grid], [a for _, a in grid], [20_000] * len(grid), workers=workers)
+    for out in outs:
         print(
             f"win={out['window']:,} algo={out['algotype']:<18} "
             f"DG={out['dg']:.5f} S_final={out['sorted_final']:.4f} "
@@ -0,0 +1,49 @@
+"""
+Case-level parallelism for the experiment drivers.
+
+Cases are independent and seed their own RNG, so they can run in any process;
+map_cases always returns results in case order. Runs are serial unless
+--workers asks for a pool. Pool workers pin numba to one thread each, since
+the batched energy kernels use prange and workers x cpu_count threads would
+oversubscribe the machine.
+"""
+
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterable, List, Optional, Sequence
+
+
+def parse_workers(description: str, argv: Optional[Sequence[str]] = None) -> int:
+    """Parse the --workers option shared by the experiment drivers."""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help="Processes to run cases in (default 1 = serial; 0 = all CPUs).",
+    )
+    args = parser.parse_args(argv)
+    if args.workers < 0:
+        parser.error("--workers must be >= 0")
+    return args.workers or os.cpu_count() or 1
+
+
+def _single_threaded_worker() -> None:
+    # Covers spawned workers (numba not imported yet) and forked ones (already
+    # imported, so the thread count is set directly).
+    os.environ["NUMBA_NUM_THREADS"] = "1"
+    try:
+        import numba
+    except ImportError:  # optional accelerator
+        return
+    numba.set_num_threads(1)
+
+
+def map_cases(fn: Callable, *iterables: Iterable, workers: int = 1) -> List:
+    """list(map(fn, *iterables)), spread over worker processes when workers > 1."""
+    if workers <= 1:
+        return list(map(fn, *iterables))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_single_threaded_worker) as pool:
+        return list(pool.map(fn, *iterables))
+
+
+__all__ = ["parse_workers", "map_cases"]
@@ -8,9 +8,11 @@ Purpose:
 """
 
 from dataclasses import dataclass
+from itertools import product
 from typing import List, Optional
 
-from cellview.engine.engine import CellViewEngine
+from cellview.engine.engine import CellViewEngine, EnergyCache
+from cellview.experiments.parallel import map_cases, parse_workers
 from cellview.heuristics.core import default_specs
 from cellview.utils import candidates as cand_utils
 from cellview.utils.rng import rng_from_hex
@@ -41,6 +43,12 @@ def factor_rank(ranked: List[dict], target: int) -> int:
     return -1
 
 
+# Per-process energies for the current N. Consecutive cases over the same N
+# (the sampled and full 46-bit corridors) only score candidates not seen yet;
+# tables for other N are dropped, so at most one N is held.
+_ENERGIES = EnergyCache()
+
+
 def run_case(case: Case, algotype: str):
     N = case.N
     seed_hex = derive_seed_hex(N)
@@ -54,6 +62,7 @@ def run_case(case: Case, algotype: str):
         full = case.mode == "corridor_full"
         candidates = cand_utils.corridor_around_sqrt(N, rng, samples=samples, window=window, full=full)
 
+    _ENERGIES.retain_only(N)
     engine = CellViewEngine(
         N=N,
         candidates=candidates,
@@ -62,6 +71,7 @@ def run_case(case: Case, algotype: str):
         rng=rng,
         sweep_order="random",  # encourage DG
         max_steps=40,
+        shared_energies=_ENERGIES,
     )
     res = engine.run()
     ranked = res["ranked_candidates"]
@@ -86,6 +96,7 @@ def run_case(case: Case, algotype: str):
 
 
 def main():
+    workers = parse_workers("Small-to-mid scaling ladder evaluation.")
     cases = [
         Case(239, 251, "full"),  # 16-bit
         Case(4093, 4099, "full"),  # ~24-bit
@@ -99,16 +110,17 @@ def main():
         Case(8_388_617, 8_388_593, "corridor_full", window=50_000, samples=200_000),  # ~46-bit (full coverage)
     ]
     algotypes = ["dirichlet11", "combo_dir11_arctan", "combo_dir11_res"]
+    grid = list(product(cases, algotypes))
     print("Small→mid scaling ladder (random sweeps, deterministic seeds):")
-    for case in cases:
-        for algo in algotypes:
-            out = run_case(case, algo)
-            print(
-                f"bits={out['bits']:>3} mode={out['mode']:<8} algo={out['algotype']:<18} "
-                f"p_rank={out['p_rank']:<4} q_rank={out['q_rank']:<4} "
-                f"DG={out['dg']:.5f} S_final={out['sorted_final']:.4f} "
-                f"A_final={out['aggregation_final']:.4f} top_n={out['top_n']}"
-            )
+    # Cases are independent and seed their own RNG; map_cases keeps grid order.
+    outs = map_cases(run_case, [c for c, _ in grid], [a for _, a in grid], workers=workers)
+    for out in outs:
+        print(
+            f"bits={out['bits']:>3} mode={out['mode']:<8} algo={out['algotype']:<18} "
+            f"p_rank={out['p_rank']:<4} q_rank={out['q_rank']:<4} "
+            f"DG={out['dg']:.5f} S_final={out['sorted_final']:.4f} "
+            f"A_final={out['aggregation_final']:.4f} top_n={out['top_n']}"
+        )
 
 
 if __name__ == "__main__":
@@ -5,10 +5,10 @@ Purpose: measure where true factors land in the energy-ranked list and collect
 DG/Aggregation signals to see if emergent metrics correlate with factor proximity.
 """
 
-from decimal import Decimal
 from typing import List, Tuple
 
 from cellview.engine.engine import CellViewEngine
+from cellview.experiments.parallel import map_cases, parse_workers
 from cellview.heuristics.core import default_specs
 from cellview.utils import candidates as cand_utils
 from cellview.utils.challenge import derive_seed_hex
@@ -57,6 +57,7 @@ def run_case(N: int, factors: Tuple[int, int], algotypes: List[str]):
 
 
 def main():
+    workers = parse_workers("Toy evaluations on small semiprimes with known factors.")
     cases: List[ToyCase] = [
         (221, (13, 17)),
         (899, (29, 31)),
@@ -65,10 +66,10 @@ def main():
         (10403, (101, 103)),
     ]
     algotypes = ["dirichlet5"]
-    results = []
-    for N, factors in cases:
-        out = run_case(N, factors, algotypes)
-        results.append(out)
+    # Cases are independent and seed their own RNG; map_cases keeps case order.
+    results = map_cases(
+        run_case, [N for N, _ in cases], [f for _, f in cases], [algotypes] * len(cases), workers=workers
+    )
 
     print("Toy evaluation (dirichlet5, full domain, deterministic seeds):")
     for r in results:
@@ -1,19 +1,29 @@
 from .core import (
     EnergyFn,
+    BatchEnergyFn,
     EnergySpec,
     dirichlet_energy,
+    dirichlet_energy_batch,
     arctan_geodesic_energy,
     z_metric_energy,
     resolve_energy,
+    evaluate_batch,
+    compile_composite,
+    composite_spec,
     default_specs,
 )
 
 __all__ = [
     "EnergyFn",
+    "BatchEnergyFn",
     "EnergySpec",
     "dirichlet_energy",
+    "dirichlet_energy_batch",
     "arctan_geodesic_energy",
     "z_metric_energy",
     "resolve_energy",
+    "evaluate_batch",
+    "compile_composite",
+    "composite_spec",
     "default_specs",
 ]
@@ -6,17 +6,23 @@ They are intended to be swapped in/out during experiments.
 """
 
 from dataclasses import dataclass
-from decimal import Decimal, getcontext
-from math import cos, pi, isqrt
-from typing import Callable, Dict
+from functools import lru_cache
+from math import atan, isqrt, ldexp, pi, sin
+from typing import Callable, Dict, List, Sequence
 
 from cellview.utils.challenge import CHALLENGE
 
-# Set generous precision for Decimal computations used in some heuristics.
-getcontext().prec = 80
+try:
+    import numpy as np
+    from numba import njit, prange
+except ImportError:  # optional accelerator
+    np = None
+    njit = None
 
 
-EnergyFn = Callable[[int, int, Dict], Decimal]
+# Energies only need to be ordered, so plain float64 is sufficient.
+EnergyFn = Callable[[int, int, Dict], float]
+BatchEnergyFn = Callable[[Sequence[int], int, Dict], List[float]]
 
 
 @dataclass(frozen=True)
@@ -26,27 +32,181 @@ class EnergySpec:
     params: Dict
 
 
-def dirichlet_energy(n: int, N: int, params: Dict) -> Decimal:
+def dirichlet_energy(n: int, N: int, params: Dict) -> float:
     """
     Dirichlet kernel amplitude |D_j(2π*(N mod n)/n)| with optional normalization.
     """
+    return dirichlet_energy_batch((n,), N, params)[0]
+
+
+def dirichlet_energy_batch(ns: Sequence[int], N: int, params: Dict) -> List[float]:
+    """
+    Batched dirichlet_energy via the closed form D_j(x) = sin((j+1/2)x) / sin(x/2).
+
+    The residue is folded to min(r, n - r) before the float conversion (D_j is even
+    and 2π-periodic), so sin(x/2) never collapses near x = 2π; r == 0 uses the
+    limit D_j(0) = 2j+1.
+    """
+    return _dirichlet_from_mods(*_residues(ns, N), N, params)
+
+
+def _dirichlet_from_mods(ns, mods, N: int, params: Dict) -> List[float]:
     j = params.get("j", 5)
     normalize = params.get("normalize", True)
     invert = params.get("invert", True)  # when True, lower energy near residue 0
-    mod_val = N % n
-    x = 2 * pi * (mod_val / n)
-    s = 1.0
-    for k in range(1, j + 1):
-        s += 2 * cos(k * x)
-    if normalize:
-        s = s / (2 * j + 1)
-    val = abs(s)
-    if invert:
-        val = 1 - val
-    return Decimal(val)
+    half_order = j + 0.5
+    peak = 2 * j + 1
+    two_pi = 2 * pi
+    if _is_native(mods):
+        return _dirichlet_from_residues(ns, mods, half_order, float(peak), normalize, invert).tolist()
+    if njit is not None and len(ns) >= _JIT_MIN_BATCH:
+        # Residues are Python ints here; only the float kernel moves to native code.
+        xs = [two_pi * (min(mod_val, n - mod_val) / n) for n, mod_val in zip(ns, mods)]
+        return _dirichlet_from_angles(
+            np.asarray(xs, dtype=np.float64), half_order, float(peak), normalize, invert
+        ).tolist()
+    out: List[float] = []
+    _sin = sin
+    for n, mod_val in zip(ns, mods):
+        mod_val = min(mod_val, n - mod_val)
+        if mod_val == 0:
+            s = float(peak)
+        else:
+            x = two_pi * (mod_val / n)
+            s = _sin(half_order * x) / _sin(0.5 * x)
+        if normalize:
+            s = s / peak
+        val = abs(s)
+        if invert:
+            val = 1 - val
+        out.append(val)
+    return out
+
+
+# Batches smaller than this are not worth the array round-trip.
+_JIT_MIN_BATCH = 1024
+_U64_MASK = (1 << 64) - 1
+_U128 = 1 << 128
+
+
+def _residues(ns: Sequence[int], N: int):
+    """
+    (ns, N mod n for each n), computed once so every residue-based energy of a
+    batch can share it. Large batches with N < 2**128 and uint64 candidates come
+    back as uint64 arrays reduced natively; otherwise as Python ints.
+    """
+    if njit is not None and len(ns) >= _JIT_MIN_BATCH and 0 <= N < _U128:
+        try:
+            ns_arr = np.array(ns, dtype=np.uint64)
+        except OverflowError:
+            ns_arr = None
+        if ns_arr is not None:
+            return ns_arr, _mods_u128(ns_arr, np.uint64(N >> 64), np.uint64(N & _U64_MASK))
+    return ns, [N % n for n in ns]
+
+
+def _is_native(mods) -> bool:
+    return np is not None and isinstance(mods, np.ndarray)
+
+
+if njit is not None:
+
+    @njit(cache=True)
+    def _kernel_value(x, half_order, peak, normalize, invert):
+        # Same arithmetic as the pure-Python loop (no fastmath), so energies are
+        # bit-identical with or without numba; x == 0 marks residue 0.
+        if x == 0.0:
+            s = peak
+        else:
+            s = np.sin(half_order * x) / np.sin(0.5 * x)
+        if normalize:
+            s = s / peak
+        val = abs(s)
+        if invert:
+            val = 1 - val
+        return val
+
+    @njit(parallel=True, cache=True)
+    def _dirichlet_from_angles(xs, half_order, peak, normalize, invert):
+        out = np.empty(xs.size)
+        for i in prange(xs.size):
+            out[i] = _kernel_value(xs[i], half_order, peak, normalize, invert)
+        return out
 
+    @njit(cache=True)
+    def _mod_u128(n_hi, n_lo, n):
+        """(n_hi * 2**64 + n_lo) mod n for uint64 operands, without 128-bit ints."""
+        zero = np.uint64(0)
+        one = np.uint64(1)
+        r = n_hi % n
+        for shift in range(63, -1, -1):
+            # r = 2r mod n; r < n, so compare against n - r rather than overflow 2r.
+            if r >= n - r:
+                r = r - (n - r)
+            else:
+                r = r + r
+            if (n_lo >> np.uint64(shift)) & one:
+                r = zero if r == n - one else r + one
+        return r
 
-def arctan_geodesic_energy(n: int, N: int, params: Dict) -> Decimal:
+    @njit(parallel=True, cache=True)
+    def _mods_u128(ns, n_hi, n_lo):
+        out = np.empty(ns.size, dtype=np.uint64)
+        for i in prange(ns.size):
+            out[i] = _mod_u128(n_hi, n_lo, ns[i])
+        return out
+
+    @njit(cache=True)
+    def _ratio(r, n):
+        """Correctly rounded r / n for 0 <= r < n < 2**64, as Python's int / int."""
+        if r == 0:
+            return 0.0
+        one = np.uint64(1)
+        mant = np.uint64(0)
+        bits = 0
+        pos = 0
+        # Binary long division: 53 significant quotient bits plus a guard bit.
+        while bits < 54:
+            pos += 1
+            if r >= n - r:
+                r = r - (n - r)
+                bit = one
+            else:
+                r = r + r
+                bit = np.uint64(0)
+            if bits == 0 and bit == 0:
+                continue
+            mant = (mant << one) | bit
+            bits += 1
+        guard = mant & one
+        mant = mant >> one
+        # Round half to even; the remainder is the sticky bit.
+        if guard and (r != 0 or mant & one):
+            mant += one
+        return ldexp(float(mant), 1 - pos)
+
+    @njit(parallel=True, cache=True)
+    def _dirichlet_from_residues(ns, mods, half_order, peak, normalize, invert):
+        two_pi = 2 * np.pi
+        out = np.empty(ns.size)
+        for i in prange(ns.size):
+            n = ns[i]
+            mod_val = mods[i]
+            if n - mod_val < mod_val:
+                mod_val = n - mod_val
+            x = two_pi * _ratio(mod_val, n)
+            out[i] = _kernel_value(x, half_order, peak, normalize, invert)
+        return out
+
+    @njit(parallel=True, cache=True)
+    def _residue_ratios(ns, mods):
+        out = np.empty(ns.size)
+        for i in prange(ns.size):
+            out[i] = _ratio(mods[i], ns[i])
+        return out
+
+
+def arctan_geodesic_energy(n: int, N: int, params: Dict) -> float:
     """
     Arctan-based curvature around sqrt(N). Lower is better (closer to sqrt).
     """
@@ -54,47 +214,111 @@ def arctan_geodesic_energy(n: int, N: int, params: Dict) -> Decimal:
     scale = params.get("scale", 1.0)
     diff = abs(n - sqrtN) / sqrtN
     # arctan is smooth near zero, giving gentle valley near sqrtN
-    return Decimal(abs(__import__("math").atan(scale * diff)))
+    return float(abs(atan(scale * diff)))
 
 
-def z_metric_energy(n: int, N: int, params: Dict) -> Decimal:
+def z_metric_energy(n: int, N: int, params: Dict) -> float:
     """
     Placeholder "Z-metric": penalize distance from sqrt and residue magnitude together.
     """
+    return _z_metric_from_mods((n,), (N % n,), N, params)[0]
+
+
+def z_metric_energy_batch(ns: Sequence[int], N: int, params: Dict) -> List[float]:
+    return _z_metric_from_mods(*_residues(ns, N), N, params)
+
+
+def _z_metric_from_mods(ns, mods, N: int, params: Dict) -> List[float]:
+    if _is_native(mods):
+        ns, mods = ns.tolist(), mods.tolist()
     sqrtN = params.get("sqrtN") or isqrt(N)
-    residue = N % n
-    dist = abs(n - sqrtN)
     # combine with weights to stay finite
     alpha = params.get("alpha", 1.0)
     beta = params.get("beta", 1.0)
-    return Decimal(alpha * (dist / sqrtN) + beta * (residue / n))
+    return [
+        float(alpha * (abs(n - sqrtN) / sqrtN) + beta * (residue / n))
+        for n, residue in zip(ns, mods)
+    ]
 
 
-def residue_energy(n: int, N: int, params: Dict) -> Decimal:
+def residue_energy(n: int, N: int, params: Dict) -> float:
     """
     Simple normalized residue magnitude. Lower is better.
     """
-    return Decimal((N % n) / n)
+    return float((N % n) / n)
 
 
-def composite_energy(n: int, N: int, params: Dict) -> Decimal:
+def residue_energy_batch(ns: Sequence[int], N: int, params: Dict) -> List[float]:
+    """
+    Batched residue_energy; large batches reduce N natively when numba is available.
+    """
+    return _residue_from_mods(*_residues(ns, N), N, params)
+
+
+def _residue_from_mods(ns, mods, N: int, params: Dict) -> List[float]:
+    if _is_native(mods):
+        return _residue_ratios(ns, mods).tolist()
+    return [mod_val / n for n, mod_val in zip(ns, mods)]
+
+
+def composite_energy(n: int, N: int, params: Dict) -> float:
     """
     Weighted sum of sub-energies. Sub-energies are looked up by name in REGISTRY.
     """
     weights: Dict[str, float] = params.get("weights", {})
     sub_params: Dict[str, Dict] = params.get("sub_params", {})
-    total = Decimal(0)
+    total = 0.0
     wsum = 0.0
     for name, w in weights.items():
         fn = REGISTRY.get(name)
         if fn is None:
             raise ValueError(f"Composite energy references unknown fn '{name}'")
         sp = sub_params.get(name, {})
-        total += Decimal(w) * fn(n, N, sp)
+        total += w * fn(n, N, sp)
         wsum += w
     if wsum == 0:
-        return Decimal(0)
-    return total / Decimal(wsum)
+        return 0.0
+    return total / wsum
+
+
+def composite_energy_batch(ns: Sequence[int], N: int, params: Dict) -> List[float]:
+    """
+    Batched composite_energy: each sub-energy is evaluated once over all ns, then weighted.
+    """
+    terms = _resolve_terms(params.get("weights", {}), params.get("sub_params", {}))
+    return _weighted_batch(terms, ns, N)
+
+
+def _resolve_terms(weights: Dict[str, float], sub_params: Dict[str, Dict]) -> List[tuple]:
+    terms = []
+    for name, w in weights.items():
+        fn = REGISTRY.get(name)
+        if fn is None:
+            raise ValueError(f"Composite energy references unknown fn '{name}'")
+        terms.append((w, fn, sub_params.get(name, {})))
+    return terms
+
+
+def _weighted_batch(terms: List[tuple], ns: Sequence[int], N: int) -> List[float]:
+    """
+    Weighted mean of (w, fn, params) terms over ns. N mod n is computed once and
+    shared by every term that only depends on the residue (see RESIDUE_BATCH).
+    """
+    wsum = sum(w for w, _, _ in terms)
+    if wsum == 0:
+        return [0.0] * len(ns)
+    shared = None
+    totals = [0.0] * len(ns)
+    for w, fn, sp in terms:
+        from_mods = RESIDUE_BATCH.get(fn)
+        if from_mods is None:
+            values = _apply_batch(fn, ns, N, sp)
+        else:
+            if shared is None:
+                shared = _residues(ns, N)
+            values = from_mods(*shared, N, sp)
+        totals = [t + w * v for t, v in zip(totals, values)]
+    return [t / wsum for t in totals]
 
 
 REGISTRY: Dict[str, EnergyFn] = {
@@ -106,6 +330,23 @@ REGISTRY: Dict[str, EnergyFn] = {
 }
 
 
+# Batched counterparts of scalar energies: one call per candidate list instead of per cell.
+BATCH_REGISTRY: Dict[EnergyFn, BatchEnergyFn] = {
+    dirichlet_energy: dirichlet_energy_batch,
+    z_metric_energy: z_metric_energy_batch,
+    residue_energy: residue_energy_batch,
+    composite_energy: composite_energy_batch,
+}
+
+
+# Energies computable from precomputed (ns, N mod n) pairs, as returned by _residues.
+RESIDUE_BATCH: Dict[EnergyFn, Callable] = {
+    dirichlet_energy: _dirichlet_from_mods,
+    z_metric_energy: _z_metric_from_mods,
+    residue_energy: _residue_from_mods,
+}
+
+
 def resolve_energy(name: str) -> EnergyFn:
     try:
         return REGISTRY[name]
@@ -113,35 +354,101 @@ def resolve_energy(name: str) -> EnergyFn:
         raise ValueError(f"Unknown energy function: {name}") from exc
 
 
+def _apply_batch(fn: EnergyFn, ns: Sequence[int], N: int, params: Dict) -> List[float]:
+    # Compiled composites carry their batch function; module energies are registered.
+    batch_fn = getattr(fn, "batch", None) or BATCH_REGISTRY.get(fn)
+    if batch_fn is not None:
+        return batch_fn(ns, N, params)
+    return [fn(n, N, params) for n in ns]
+
+
+def evaluate_batch(spec: EnergySpec, ns: Sequence[int], N: int) -> List[float]:
+    """
+    Evaluate spec over all ns, using the batched implementation when one is
+    registered or attached to spec.fn as fn.batch.
+    """
+    return _apply_batch(spec.fn, ns, N, spec.params)
+
+
+def compile_composite(weights: Dict[str, float], sub_params: Dict[str, Dict]) -> EnergyFn:
+    """
+    Resolve a weighted composite once, returning a scalar EnergyFn whose batched
+    counterpart (attached as fn.batch) evaluates each sub-energy over the whole
+    candidate list, sharing N mod n between residue-based terms, and sums the
+    weighted results. Unlike composite_energy, the registry lookups happen here
+    rather than per candidate, and the returned function ignores its params
+    argument. Nothing is registered globally: the batch function lives and dies
+    with the returned callable.
+    """
+    # Private copies, so later edits to the caller's dicts cannot change what
+    # the compiled terms compute.
+    terms = [(w, fn, dict(sp)) for w, fn, sp in _resolve_terms(weights, sub_params)]
+    wsum = sum(w for w, _, _ in terms)
+
+    def energy(n: int, N: int, params: Dict) -> float:
+        if wsum == 0:
+            return 0.0
+        total = 0.0
+        for w, fn, sp in terms:
+            total += w * fn(n, N, sp)
+        return total / wsum
+
+    def energy_batch(ns: Sequence[int], N: int, params: Dict) -> List[float]:
+        return _weighted_batch(terms, ns, N)
+
+    energy.batch = energy_batch
+    return energy
+
+
+def composite_spec(name: str, weights: Dict[str, float], sub_params: Dict[str, Dict]) -> EnergySpec:
+    """
+    EnergySpec backed by compile_composite.
+
+    params hold a snapshot of weights/sub_params for logging only: the compiled
+    fn ignores them, so editing spec.params does not change the energy. Build a
+    new spec with composite_spec to change the composite.
+    """
+    weights = dict(weights)
+    sub_params = {name: dict(sp) for name, sp in sub_params.items()}
+    return EnergySpec(
+        name,
+        compile_composite(weights, sub_params),
+        {"weights": weights, "sub_params": sub_params},
+    )
+
+
 def default_specs() -> Dict[str, EnergySpec]:
     """
     Provide a small set of ready-to-use energy specs.
+
+    The specs are built once; callers get a fresh shallow copy of the mapping so
+    adding entries (as the engine does for registry fallbacks) does not leak.
+    Spec params are shared and must be treated as read-only.
     """
+    return dict(_build_default_specs())
+
+
+@lru_cache(maxsize=1)
+def _build_default_specs() -> Dict[str, EnergySpec]:
     return {
         "dirichlet5": EnergySpec("dirichlet5", dirichlet_energy, {"j": 5, "normalize": True, "invert": True}),
         "dirichlet11": EnergySpec("dirichlet11", dirichlet_energy, {"j": 11, "normalize": True, "invert": True}),
         "arctan": EnergySpec("arctan", arctan_geodesic_energy, {"sqrtN": CHALLENGE.sqrt_n, "scale": 2.0}),
         "zmetric": EnergySpec("zmetric", z_metric_energy, {"sqrtN": CHALLENGE.sqrt_n, "alpha": 0.2, "beta": 1.0}),
-        "combo_dir11_arctan": EnergySpec(
+        "combo_dir11_arctan": composite_spec(
             "combo_dir11_arctan",
-            composite_energy,
-            {
-                "weights": {"dirichlet": 0.6, "arctan": 0.4},
-                "sub_params": {
-                    "dirichlet": {"j": 11, "normalize": True, "invert": True},
-                    "arctan": {"sqrtN": CHALLENGE.sqrt_n, "scale": 2.5},
-                },
+            weights={"dirichlet": 0.6, "arctan": 0.4},
+            sub_params={
+                "dirichlet": {"j": 11, "normalize": True, "invert": True},
+                "arctan": {"sqrtN": CHALLENGE.sqrt_n, "scale": 2.5},
             },
         ),
-        "combo_dir11_res": EnergySpec(
+        "combo_dir11_res": composite_spec(
             "combo_dir11_res",
-            composite_energy,
-            {
-                "weights": {"dirichlet": 0.6, "residue": 0.4},
-                "sub_params": {
-                    "dirichlet": {"j": 11, "normalize": True, "invert": True},
-                    "residue": {},
-                },
+            weights={"dirichlet": 0.6, "residue": 0.4},
+            sub_params={
+                "dirichlet": {"j": 11, "normalize": True, "invert": True},
+                "residue": {},
             },
         ),
     }
@@ -149,10 +456,15 @@ def default_specs() -> Dict[str, EnergySpec]:
 
 __all__ = [
     "EnergyFn",
+    "BatchEnergyFn",
     "EnergySpec",
     "dirichlet_energy",
+    "dirichlet_energy_batch",
     "arctan_geodesic_energy",
     "z_metric_energy",
     "resolve_energy",
+    "evaluate_batch",
+    "compile_composite",
+    "composite_spec",
     "default_specs",
 ]
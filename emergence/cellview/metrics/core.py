@@ -3,17 +3,32 @@ Metrics for emergent signals: sortedness, aggregation, delayed gratification (DG
 """
 
 from dataclasses import dataclass
+from itertools import islice
+from operator import eq, gt
 from typing import List, Sequence, Tuple
 
+try:
+    import numpy as np
+except ImportError:  # optional accelerator
+    np = None
+
+
+def _is_ndarray(values) -> bool:
+    return np is not None and isinstance(values, np.ndarray)
+
 
 def sortedness(values: Sequence[int]) -> float:
     """
     Measure local monotonicity by counting adjacent inversions.
     Returns 1.0 when non-decreasing, 0 when fully reversed.
+    Accepts any sequence; NumPy arrays are compared in one vectorized pass.
     """
     if len(values) < 2:
         return 1.0
-    inversions = sum(1 for a, b in zip(values, values[1:]) if a > b)
+    if _is_ndarray(values):
+        inversions = int(np.count_nonzero(values[:-1] > values[1:]))
+    else:
+        inversions = sum(map(gt, values, islice(values, 1, None)))
     return 1.0 - inversions / (len(values) - 1)
 
 
@@ -21,10 +36,14 @@ def aggregation(algotypes: Sequence[str]) -> float:
     """
     Fraction of adjacent pairs sharing the same algotype.
     Baseline for random labels with ~3 types is ~0.11; higher implies clustering.
+    Accepts labels or int-encoded ids (NumPy arrays are compared vectorized).
     """
     if len(algotypes) < 2:
         return 1.0
-    same = sum(1 for a, b in zip(algotypes, algotypes[1:]) if a == b)
+    if _is_ndarray(algotypes):
+        same = int(np.count_nonzero(algotypes[:-1] == algotypes[1:]))
+    else:
+        same = sum(map(eq, algotypes, islice(algotypes, 1, None)))
     return same / (len(algotypes) - 1)
 
 
@@ -37,36 +56,53 @@ class DGEpisode:
     new_peak: float
 
 
-def detect_dg(series: Sequence[float], epsilon: float = 1e-3, hysteresis: float = 1e-3) -> Tuple[List[DGEpisode], float]:
+# Below this length the NumPy round-trip costs more than the plain scan.
+_VECTORIZE_MIN_LEN = 256
+
+
+def _initial_direction(series: Sequence[float], epsilon: float) -> int:
+    """Direction (1 up, -1 down, 0 flat) of the first move larger than epsilon."""
+    first = series[0]
+    for val in series:
+        if abs(val - first) > epsilon:
+            return 1 if val > first else -1
+    return 0
+
+
+def _initial_direction_np(arr, epsilon: float) -> int:
+    moved = np.flatnonzero(np.abs(arr - arr[0]) > epsilon)
+    if moved.size == 0:
+        return 0
+    return 1 if arr[moved[0]] > arr[0] else -1
+
+
+def _turning_points_np(arr):
     """
-    Extract delayed-gratification episodes from a time series S(t).
-    Definition: Peak -> Valley -> Higher Peak.
-    DG Index = Sum( (New_Peak - Valley) / (Peak - Valley) ) for all such episodes.
-    
-    Uses a standard peak/valley detector first, then scans the sequence of extrema.
+    Indices that can change the hysteresis detector's state: both endpoints and
+    the first sample of every strict local extremum (plateaus collapsed).
+    Interior points of monotone runs and repeats of the previous value never
+    create, move, or confirm an extremum, so the scan may skip them.
     """
-    if len(series) < 3:
-        return [], 0.0
+    keep = np.flatnonzero(np.diff(arr) != 0) + 1
+    idx = np.concatenate(([0], keep))
+    slope = np.sign(np.diff(arr[idx]))
+    turns = idx[1:-1][slope[:-1] != slope[1:]]
+    return np.concatenate(([0], turns, [len(arr) - 1])).tolist()
 
-    # 1. Identify Extrema (Peaks and Valleys)
-    extrema: List[Tuple[str, float, int]] = [] # (type, value, index)
-    
-    # Direction: 1 = going up, -1 = going down
-    direction = 0
-    last_val = series[0]
-    last_idx = 0
-    
-    # Initialize direction based on first move > epsilon
-    for i, val in enumerate(series):
-        if abs(val - last_val) > epsilon:
-            direction = 1 if val > last_val else -1
-            break
-            
-    # Simple robust local extrema finder
-    current_extreme_val = series[0]
+
+def _hysteresis_extrema(
+    indices, values: Sequence[float], direction: int, epsilon: float
+) -> List[Tuple[str, float, int]]:
+    """
+    Simple robust local extrema finder: an extremum is confirmed once the series
+    retreats more than epsilon from it. Returns (type, value, index) tuples.
+    values[k] is the series value at indices[k]; indices starts at 0.
+    """
+    extrema: List[Tuple[str, float, int]] = []
+    current_extreme_val = values[0]
     current_extreme_idx = 0
-    
-    for i, val in enumerate(series):
+
+    for i, val in zip(indices, values):
         if direction == 1: # Climbing, looking for Peak
             if val > current_extreme_val:
                 current_extreme_val = val
@@ -87,6 +123,34 @@ def detect_dg(series: Sequence[float], epsilon: float = 1e-3, hysteresis: float
                 direction = 1
                 current_extreme_val = val
                 current_extreme_idx = i
+    return extrema
+
+
+def detect_dg(series: Sequence[float], epsilon: float = 1e-3, hysteresis: float = 1e-3) -> Tuple[List[DGEpisode], float]:
+    """
+    Extract delayed-gratification episodes from a time series S(t).
+    Definition: Peak -> Valley -> Higher Peak.
+    DG Index = Sum( (New_Peak - Valley) / (Peak - Valley) ) for all such episodes.
+    
+    Uses a standard peak/valley detector first, then scans the sequence of extrema.
+    Long series (or NumPy input) are pre-reduced to their turning points with
+    vectorized diffs before the hysteresis scan; the extrema are identical.
+    """
+    if len(series) < 3:
+        return [], 0.0
+
+    # 1. Identify Extrema (Peaks and Valleys)
+    if _is_ndarray(series) or (np is not None and len(series) > _VECTORIZE_MIN_LEN):
+        arr = np.asarray(series, dtype=np.float64)
+        direction = _initial_direction_np(arr, epsilon)
+        candidates = _turning_points_np(arr)
+        # Only the turning points are boxed back into Python floats.
+        values = arr[candidates].tolist()
+    else:
+        direction = _initial_direction(series, epsilon)
+        candidates = range(len(series))
+        values = series
+    extrema = _hysteresis_extrema(candidates, values, direction, epsilon)
 
     # 2. Scan P -> V -> P patterns
     episodes: List[DGEpisode] = []
@@ -0,0 +1,114 @@
+"""
+Native Miller-Rabin for odd n < 2^63.
+
+CPython's pow() boxes every intermediate; for word-sized candidates the whole
+test fits in uint64 registers. Products are formed as 128-bit (hi, lo) pairs
+from 32-bit halves and reduced with Montgomery REDC, which stays overflow-free
+while n < 2^63. Only compiled when numba is importable; z5d_prime falls back to
+the pure-Python test otherwise.
+"""
+
+try:
+    import numpy as np
+    from numba import njit
+except ImportError:  # optional accelerator
+    np = None
+    njit = None
+
+NUMBA_AVAILABLE = njit is not None
+
+# Largest n handled here (exclusive).
+U63 = 1 << 63
+
+if NUMBA_AVAILABLE:
+    _MASK32 = np.uint64(0xFFFFFFFF)
+    _SHIFT32 = np.uint64(32)
+    _ZERO = np.uint64(0)
+    _ONE = np.uint64(1)
+    _TWO = np.uint64(2)
+    # Sinclair's bases: deterministic for every n < 2^64.
+    _WITNESSES = np.array([2, 325, 9375, 28178, 450775, 9780504, 1795265022], dtype=np.uint64)
+
+    @njit(cache=True)
+    def _mul_wide(a, b):
+        """(hi, lo) words of the 128-bit product a * b."""
+        a_lo = a & _MASK32
+        a_hi = a >> _SHIFT32
+        b_lo = b & _MASK32
+        b_hi = b >> _SHIFT32
+        p0 = a_lo * b_lo
+        p1 = a_lo * b_hi
+        p2 = a_hi * b_lo
+        mid = (p0 >> _SHIFT32) + (p1 & _MASK32) + (p2 & _MASK32)
+        hi = a_hi * b_hi + (p1 >> _SHIFT32) + (p2 >> _SHIFT32) + (mid >> _SHIFT32)
+        return hi, a * b
+
+    @njit(cache=True)
+    def _redc_mul(a, b, n, n_neg_inv):
+        """a * b * 2^-64 mod n for a, b < n < 2^63 (Montgomery product)."""
+        t_hi, t_lo = _mul_wide(a, b)
+        m = t_lo * n_neg_inv
+        mn_hi, mn_lo = _mul_wide(m, n)
+        # t + m*n is divisible by 2^64; the low words cancel, leaving a carry
+        # exactly when t_lo is nonzero.
+        carry = _ONE if t_lo != _ZERO else _ZERO
+        u = t_hi + mn_hi + carry
+        if u >= n:
+            u -= n
+        return u
+
+    @njit(cache=True)
+    def _miller_rabin_u64(n):
+        """Deterministic Miller-Rabin for odd 3 < n < 2^63."""
+        # n_neg_inv = -n^-1 mod 2^64 by Newton iteration (each step doubles
+        # the correct low bits, starting from 3).
+        inv = n
+        for _ in range(5):
+            inv = inv * (_TWO - n * inv)
+        n_neg_inv = _ZERO - inv
+        # R = 2^64 mod n and R^2 mod n for conversion into Montgomery form.
+        r1 = (_ZERO - n) % n
+        r2 = r1
+        for _ in range(64):
+            r2 = r2 - (n - r2) if r2 >= n - r2 else r2 + r2
+        minus_one = n - r1
+
+        d = n - _ONE
+        s = 0
+        while d & _ONE == _ZERO:
+            d >>= _ONE
+            s += 1
+
+        for i in range(_WITNESSES.size):
+            a = _WITNESSES[i] % n
+            if a == _ZERO:
+                continue
+            base = _redc_mul(a, r2, n, n_neg_inv)
+            x = r1
+            e = d
+            while e != _ZERO:
+                if e & _ONE:
+                    x = _redc_mul(x, base, n, n_neg_inv)
+                base = _redc_mul(base, base, n, n_neg_inv)
+                e >>= _ONE
+            if x == r1 or x == minus_one:
+                continue
+            for _ in range(s - 1):
+                x = _redc_mul(x, x, n, n_neg_inv)
+                if x == minus_one:
+                    break
+            else:
+                return False
+        return True
+
+
+def miller_rabin_u64(n: int) -> bool:
+    """
+    Deterministic Miller-Rabin for odd 3 < n < 2^63 (requires numba).
+    n is passed as uint64: an int64-typed call would mix signed and unsigned
+    operands, which numba promotes to float64.
+    """
+    return bool(_miller_rabin_u64(np.uint64(n)))
+
+
+__all__ = ["NUMBA_AVAILABLE", "U63", "miller_rabin_u64"]
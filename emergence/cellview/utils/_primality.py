@@ -0,0 +1,169 @@
+"""
+Local primality: the single is_prime / next_prime implementation.
+
+Backed by GMP when gmpy2 is installed; otherwise deterministic Miller-Rabin
+(numba-compiled for word-sized n, see _mr_u64) behind a small-prime screen,
+with a segmented sieve for next_prime. z5d_prime layers the optional Z5D
+tool on top of this module, so every caller shares one kernel.
+"""
+
+from math import gcd, isqrt, prod
+
+from ._mr_u64 import NUMBA_AVAILABLE, U63, miller_rabin_u64
+
+try:
+    import gmpy2
+except ImportError:  # optional accelerator
+    gmpy2 = None
+
+
+# Deterministic Miller-Rabin bases. Sinclair's 7 bases are exact for n < 2^64,
+# the first 12 primes for n < 3.18e23 and the first 13 for n < 3.32e24
+# (Sorenson & Webster). Past that no finite set is proven, so a fixed set of
+# the first 16 primes is used.
+_WITNESSES_U64 = (2, 325, 9375, 28178, 450775, 9780504, 1795265022)
+_WITNESSES_SMALL = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)
+_WITNESSES_13 = _WITNESSES_SMALL + (41,)
+_WITNESSES_LARGE = _WITNESSES_SMALL + (41, 43, 47, 53)
+_PSI_12 = 318665857834031151167461
+_PSI_13 = 3317044064679887385961981
+
+
+def _miller_rabin(n: int) -> bool:
+    """
+    Miller-Rabin primality test with fixed witnesses, for odd n > 3.
+    
+    Args:
+        n: Number to test
+    
+    Returns:
+        True if n is prime (provably for n < 3.32e24, with overwhelming
+        probability beyond), False if definitely composite
+    """
+    if NUMBA_AVAILABLE and n < U63:
+        return miller_rabin_u64(n)
+    if n < (1 << 64):
+        witnesses = _WITNESSES_U64
+    elif n < _PSI_12:
+        witnesses = _WITNESSES_SMALL
+    elif n < _PSI_13:
+        witnesses = _WITNESSES_13
+    else:
+        witnesses = _WITNESSES_LARGE
+    
+    # Write n-1 as 2^r * d
+    r, d = 0, n - 1
+    while d % 2 == 0:
+        r += 1
+        d //= 2
+    
+    # Witness loop
+    for a in witnesses:
+        a %= n
+        if a == 0:
+            continue
+        x = pow(a, d, n)
+        
+        if x == 1 or x == n - 1:
+            continue
+        
+        for _ in range(r - 1):
+            x = x * x % n  # cheaper than pow(x, 2, n) for a single squaring
+            if x == n - 1:
+                break
+        else:
+            return False
+    
+    return True
+
+
+def is_prime(n: int) -> bool:
+    """
+    Primality test using Miller-Rabin.
+    Uses trial division for small numbers, or GMP when gmpy2 is installed.
+    """
+    if n < 2:
+        return False
+    if gmpy2 is not None:
+        return bool(gmpy2.is_prime(n))
+    if n == 2 or n == 3:
+        return True
+    if n % 2 == 0:
+        return False
+    
+    # For small numbers, use trial division
+    if n < 1000:
+        i = 3
+        while i * i <= n:
+            if n % i == 0:
+                return False
+            i += 2
+        return True
+    
+    # Cheap rejection before Miller-Rabin: one gcd against the product of the
+    # odd primes below 1000 (n >= 1000, so a shared factor means composite).
+    if gcd(n, _SMALL_PRIMES_PRODUCT) != 1:
+        return False
+    
+    # For large numbers, use Miller-Rabin
+    return _miller_rabin(n)
+
+
+def _odd_primes_below(limit: int) -> tuple:
+    """Odd primes < limit (sieve of Eratosthenes)."""
+    sieve = bytearray([1]) * limit
+    sieve[:2] = b"\x00\x00"
+    for i in range(2, isqrt(limit - 1) + 1):
+        if sieve[i]:
+            sieve[i * i::i] = bytes(len(range(i * i, limit, i)))
+    return tuple(i for i in range(3, limit) if sieve[i])
+
+
+# Sieving parameters for next_prime. Larger tables/windows were
+# measured slower: striking by primes past a few hundred removes few extra
+# Miller-Rabin calls but costs a slice assignment per prime per window.
+_SIEVE_PRIMES = _odd_primes_below(300)
+_SIEVE_WINDOW = 256  # odd numbers per segment
+
+# Trial-division screen for is_prime.
+_SMALL_PRIMES_PRODUCT = prod(_odd_primes_below(1000))
+
+
+def next_prime(n: int) -> int:
+    """
+    Find the next prime >= n using Miller-Rabin.
+
+    With gmpy2 installed this is GMP's next_prime. Otherwise odd candidates are
+    scanned in segments; multiples of small primes are struck out with a
+    bytearray sieve so Miller-Rabin only runs on the survivors.
+    """
+    if n < 2:
+        return 2
+    if gmpy2 is not None:
+        return int(gmpy2.next_prime(n - 1))
+    if n == 2:
+        return 2
+    if n % 2 == 0:
+        n += 1
+    while True:
+        # sieve[i] stands for the odd number n + 2i.
+        sieve = bytearray([1]) * _SIEVE_WINDOW
+        end = n + 2 * (_SIEVE_WINDOW - 1)
+        for p in _SIEVE_PRIMES:
+            pp = p * p
+            if pp > end:
+                break
+            # First index to strike: p*p if it lies in the window (so p itself
+            # survives), else the first odd multiple of p >= n.
+            if pp >= n:
+                start = (pp - n) // 2
+            else:
+                start = ((p - n % p) * ((p + 1) // 2)) % p
+            sieve[start::p] = bytes(len(range(start, _SIEVE_WINDOW, p)))
+        for i, alive in enumerate(sieve):
+            if alive and is_prime(n + 2 * i):
+                return n + 2 * i
+        n += 2 * _SIEVE_WINDOW
+
+
+__all__ = ["is_prime", "next_prime"]
@@ -73,19 +73,15 @@ def corridor_around_sqrt(
     center = center if center is not None else isqrt(n)
     low = max(2, center - window)
     high = center + window
-    # Rejection sampling to enforce uniqueness without building huge sets first.
     span = high - low + 1
     if full or samples >= span:
         return list(range(low, high + 1))
 
-    seen = set()
-    candidates: List[int] = []
-    while len(candidates) < samples:
-        val = rng.randrange(low, high + 1)
-        if val not in seen:
-            seen.add(val)
-            candidates.append(val)
-    return candidates
+    # Sampling without replacement from a lazy range; nothing is materialized.
+    # When span is large relative to samples, random.sample takes its set-based
+    # branch and yields the same sequence the old randrange/rejection loop did;
+    # denser corridors switch to its pool method (different, still seeded).
+    return rng.sample(range(low, high + 1), samples)
 
 
 def multiband_corridors(
@@ -99,14 +95,9 @@ def multiband_corridors(
     out: List[int] = []
     for center, window, samples in bands:
         out.extend(corridor_around_sqrt(n, rng, samples=samples, window=window, center=center))
-    # Deduplicate while preserving band-relative order
-    seen = set()
-    deduped = []
-    for v in out:
-        if v not in seen:
-            seen.add(v)
-            deduped.append(v)
-    return deduped
+    # Deduplicate while preserving band-relative order (dicts keep insertion
+    # order, so this is the old seen-set loop done in C).
+    return list(dict.fromkeys(out))
 
 
 def guard_dense_domain_for_challenge(candidate_count: int, n: int = CHALLENGE.n) -> None:
@@ -14,16 +14,29 @@ Prime Generation:
     See: https://github.com/zfifteen/z5d-prime-predictor
 """
 
-import random
-import json
+import os
 import yaml
-from dataclasses import dataclass, asdict, field
+from copy import deepcopy
+from dataclasses import dataclass, asdict, field, replace
+from functools import lru_cache
+from hashlib import shake_128
 from typing import Optional, List, Dict, Any
 from pathlib import Path
 from math import isqrt
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # libyaml not built into PyYAML
+    from yaml import SafeLoader as _YamlLoader
+
+from .logging import write_json
+
 # Import Z5D prime generator wrapper
-from .z5d_prime import next_prime as z5d_next_prime, is_prime as z5d_is_prime
+from .z5d_prime import (
+    next_prime as z5d_next_prime,
+    next_prime_batch as z5d_next_prime_batch,
+    is_prime as z5d_is_prime,
+)
 
 # Canonical constants
 BASE_SEED = 42
@@ -31,6 +44,9 @@ RATIO = 0.25  # small factor gets 25% of bits → 1:3 ratio
 CHALLENGE_N = 137524771864208156028430259349934309717
 CHALLENGE_BITS = 127
 
+# Draws of q per gate before accepting an N off target_bits.
+_Q_ATTEMPTS = 8
+
 
 def _simple_next_prime(n: int) -> int:
     """
@@ -52,7 +68,7 @@ def _is_prime(n: int) -> bool:
     return z5d_is_prime(n, use_z5d=True)
 
 
-@dataclass
+@dataclass(slots=True)
 class GateSemiprime:
     """Represents a single gate in the validation ladder."""
     gate: str
@@ -76,6 +92,17 @@ def get_effective_seed(base_seed: int, bit_size: int) -> int:
     return base_seed + bit_size
 
 
+def _det_randint(seed: int, nbits: int, counter: int) -> int:
+    """
+    Deterministic nbits-wide integer (top bit set) for draw number `counter`
+    under `seed`, read from SHAKE-128 in counter mode. Replaces seeding a
+    Mersenne Twister per gate just to take two draws.
+    """
+    key = seed.to_bytes(8, "big", signed=True) + counter.to_bytes(4, "big")
+    value = int.from_bytes(shake_128(key).digest((nbits + 7) // 8), "big")
+    return (value & ((1 << nbits) - 1)) | (1 << (nbits - 1))
+
+
 def generate_unbalanced_semiprime(
     bit_size: int, 
     seed: int, 
@@ -89,33 +116,54 @@ def generate_unbalanced_semiprime(
     
     Args:
         bit_size: Target bit length of N
-        seed: RNG seed for reproducibility
+        seed: Seed for the deterministic candidate draws
         ratio: Fraction of bits for smaller factor (default 0.25 = 1:3 ratio)
     
     Returns:
         GateSemiprime with all fields populated
     """
-    rng = random.Random(seed)
-    
+    p = _simple_next_prime(_draw_p_candidate(bit_size, seed, ratio))
+    q = _simple_next_prime(_draw_q_candidate(bit_size, seed, p))
+    q = _fit_q(bit_size, seed, p, q)
+    return _finalize_gate(p, q, bit_size, seed, ratio)
+
+
+def _draw_p_candidate(bit_size: int, seed: int, ratio: float) -> int:
+    """Odd starting point for the small factor p (~ratio of the bits)."""
     # Small factor p gets ~ratio of the bits
     p_bits = max(4, int(bit_size * ratio))  # at least 4 bits for meaningful prime
-    
-    # Generate p (small factor)
-    p_min = 1 << (p_bits - 1)  # ensure correct bit length
-    p_max = (1 << p_bits) - 1
-    p_candidate = rng.randint(p_min, p_max) | 1  # ensure odd
-    p = _simple_next_prime(p_candidate)
-    
-    # Compute required q_bits to hit target N bit size
-    # N = p * q, so log2(N) ≈ log2(p) + log2(q)
-    q_bits = bit_size - p.bit_length()
-    q_bits = max(p.bit_length() + 1, q_bits)  # ensure q > p
-    
-    q_min = 1 << (q_bits - 1)
-    q_max = (1 << q_bits) - 1
-    q_candidate = rng.randint(q_min, q_max) | 1  # ensure odd
-    q = _simple_next_prime(q_candidate)
-    
+    return _det_randint(seed, p_bits, 0) | 1  # p_bits wide, odd
+
+
+def _draw_q_candidate(bit_size: int, seed: int, p: int, attempt: int = 0) -> int:
+    """
+    Odd starting point for q, drawn from the range of q for which p * q has
+    exactly bit_size bits. Each retry attempt reads a fresh counter.
+    """
+    q_min = max(-(-(1 << (bit_size - 1)) // p), p + 1)  # ceil(2^(b-1) / p); ensure q > p
+    q_max = max(((1 << bit_size) - 1) // p, q_min)
+    span = q_max - q_min + 1
+    # 64 spare bits keep the modulo bias negligible
+    draw = _det_randint(seed, span.bit_length() + 64, 1 + attempt)
+    return (q_min + draw % span) | 1  # odd
+
+
+def _fit_q(bit_size: int, seed: int, p: int, q: int) -> int:
+    """
+    Redraw q (bounded) while p * q misses bit_size.
+
+    Candidates already satisfy the width, so a miss only happens when the
+    next prime overshoots the top of the q range; each redraw is an
+    independent retry, and the first attempt almost always succeeds.
+    """
+    for attempt in range(1, _Q_ATTEMPTS):
+        if (p * q).bit_length() == bit_size:
+            break
+        q = _simple_next_prime(_draw_q_candidate(bit_size, seed, p, attempt))
+    return q
+
+
+def _finalize_gate(p: int, q: int, bit_size: int, seed: int, ratio: float) -> GateSemiprime:
     # Ensure p < q (p is the small factor)
     if p > q:
         p, q = q, p
@@ -150,21 +198,37 @@ def generate_ladder(
     
     Returns:
         List of GateSemiprime objects in ascending bit order
-    """
-    ladder = []
     
-    # Generate gates from 10 to 130 in increments of 10
-    for bits in range(10, 131, 10):
-        effective_seed = get_effective_seed(base_seed, bits)
-        gate = generate_unbalanced_semiprime(bits, effective_seed, ratio)
-        ladder.append(gate)
+    The ladder is generated once per (base_seed, ratio) per process; callers
+    receive fresh copies of the cached gates.
+    """
+    return [replace(g) for g in _generate_ladder_cached(base_seed, ratio)]
+
+
+@lru_cache(maxsize=8)
+def _generate_ladder_cached(base_seed: int, ratio: float) -> tuple:
+    # Generate gates from 10 to 130 in increments of 10. q's width depends on
+    # the final p, so primes are found in two batches (all p, then all q)
+    # rather than two calls per gate.
+    sizes = range(10, 131, 10)
+    seeds = [get_effective_seed(base_seed, bits) for bits in sizes]
+    ps = z5d_next_prime_batch(
+        [_draw_p_candidate(bits, seed, ratio) for bits, seed in zip(sizes, seeds)]
+    )
+    qs = z5d_next_prime_batch(
+        [_draw_q_candidate(bits, seed, p) for bits, seed, p in zip(sizes, seeds, ps)]
+    )
+    ladder = [
+        _finalize_gate(p, _fit_q(bits, seed, p, q), bits, seed, ratio)
+        for bits, seed, p, q in zip(sizes, seeds, ps, qs)
+    ]
     
     # Insert G127 (canonical challenge, factors unknown)
     g127_idx = next(i for i, g in enumerate(ladder) if g.target_bits > 127)
     g127 = GateSemiprime(
         gate="G127",
         target_bits=127,
-        actual_bits=CHALLENGE_N.bit_length(),
+        actual_bits=CHALLENGE_BITS,
         N=CHALLENGE_N,
         p=None,
         q=None,
@@ -179,7 +243,12 @@ def generate_ladder(
     )
     ladder.insert(g127_idx, g127)
     
-    return ladder
+    return tuple(ladder)
+
+
+@lru_cache(maxsize=8)
+def _gates_by_name(base_seed: int, ratio: float) -> Dict[str, GateSemiprime]:
+    return {g.gate: g for g in _generate_ladder_cached(base_seed, ratio)}
 
 
 def load_ladder_yaml(path: Path = None) -> Dict[str, Any]:
@@ -196,8 +265,16 @@ def load_ladder_yaml(path: Path = None) -> Dict[str, Any]:
         # Default to validation_ladder.yaml in emergence/ directory
         path = Path(__file__).parent.parent.parent / "validation_ladder.yaml"
     
+    path = os.path.realpath(path)
+    # Unchanged files are served from the cache; the copy keeps callers from
+    # mutating the cached dict.
+    return deepcopy(_load_yaml_cached(path, os.stat(path).st_mtime_ns))
+
+
+@lru_cache(maxsize=8)
+def _load_yaml_cached(path: str, mtime_ns: int) -> Dict[str, Any]:
     with open(path, "r", encoding="utf-8") as f:
-        return yaml.safe_load(f)
+        return yaml.load(f, Loader=_YamlLoader)
 
 
 def get_gate(gate_name: str, ladder: List[GateSemiprime] = None) -> Optional[GateSemiprime]:
@@ -206,13 +283,16 @@ def get_gate(gate_name: str, ladder: List[GateSemiprime] = None) -> Optional[Gat
     
     Args:
         gate_name: Gate identifier like "G030" or "G127"
-        ladder: Pre-generated ladder (if None, generates fresh)
+        ladder: Pre-generated ladder (if None, uses the canonical ladder)
     
     Returns:
         GateSemiprime or None if not found
     """
     if ladder is None:
-        ladder = generate_ladder()
+        # Canonical lookups hit a name index over the cached ladder instead of
+        # copying the whole ladder to scan it.
+        gate = _gates_by_name(BASE_SEED, RATIO).get(gate_name)
+        return replace(gate) if gate is not None else None
     
     for gate in ladder:
         if gate.gate == gate_name:
@@ -262,8 +342,7 @@ def export_ladder_json(path: Path = None, ladder: List[GateSemiprime] = None) ->
         "ladder": [asdict(g) for g in ladder]
     }
     
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+    write_json(str(path), data)
     
     print(f"Ladder exported to {path}")
 
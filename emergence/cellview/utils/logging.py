@@ -2,24 +2,60 @@
 Structured logging helpers for reproducible runs.
 """
 
+import itertools
 import json
 import os
 import time
 from typing import Any, Dict
 
+try:
+    import orjson
+except ImportError:  # optional accelerator
+    orjson = None
+
+
+# Directories already created by this process (absolute paths).
+_DIRS_MADE = set()
+_RUN_COUNTER = itertools.count()
+
 
 def ensure_dir(path: str) -> None:
+    """makedirs(path, exist_ok=True), skipped for directories made earlier in this process."""
+    key = os.path.abspath(path)
+    if key in _DIRS_MADE:
+        return
     os.makedirs(path, exist_ok=True)
+    _DIRS_MADE.add(key)
 
 
 def timestamp_id(prefix: str = "run") -> str:
-    return f"{prefix}_{int(time.time() * 1000)}"
+    """
+    Unique run id. Millisecond timestamps collided across concurrent runs;
+    the pid separates processes and the counter separates calls within one.
+    """
+    return f"{prefix}_{time.time_ns()}_{os.getpid()}_{next(_RUN_COUNTER)}"
+
+
+def _encode_json(payload: Dict[str, Any]) -> bytes:
+    """
+    Indented JSON for payload. orjson only takes ints up to 64 bits, so
+    payloads carrying wider ints (or types it does not know) go through the
+    stdlib encoder instead.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(payload, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        except orjson.JSONEncodeError:
+            pass
+    return json.dumps(payload, indent=2).encode("utf-8")
 
 
 def write_json(path: str, payload: Dict[str, Any]) -> None:
-    ensure_dir(os.path.dirname(path))
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(payload, f, indent=2)
+    directory = os.path.dirname(path)
+    if directory:
+        ensure_dir(directory)
+    with open(path, "wb") as f:
+        f.write(_encode_json(payload))
 
 
 __all__ = ["ensure_dir", "timestamp_id", "write_json"]
@@ -9,23 +9,35 @@ The Z5D tool uses a proprietary five-dimensional algorithm based on
 the Riemann Hypothesis to efficiently find large primes.
 
 Usage:
-    - If Z5D tools are available (compiled), uses them via subprocess
-    - Otherwise, falls back to Miller-Rabin probabilistic primality testing
+    - If Z5D tools are available (compiled), uses them via subprocess;
+      set Z5D_BIN to point at a prime_generator binary outside PATH
+    - Otherwise, falls back to the local implementation in _primality
+      (GMP or Miller-Rabin)
 
 This allows the code to work on any platform while leveraging Z5D
 when available on Apple Silicon with MPFR/GMP installed.
 """
 
+import os
 import subprocess
 import shutil
-import random
+from functools import cache
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional, Sequence
 
+from ._primality import is_prime as _fallback_is_prime, next_prime as _fallback_next_prime
 
-# Z5D tool paths (can be customized via environment or config)
-Z5D_PRIME_GENERATOR = "prime_generator"  # Expected in PATH or explicit path
-Z5D_AVAILABLE = None  # Lazy detection
+
+# Z5D tool paths: Z5D_BIN may name the binary or give an explicit path.
+Z5D_PRIME_GENERATOR = os.environ.get("Z5D_BIN", "prime_generator")
+
+
+@cache
+def _z5d_executable() -> Optional[str]:
+    """
+    Resolve the Z5D prime_generator executable once per process (None if absent).
+    """
+    return shutil.which(Z5D_PRIME_GENERATOR)
 
 
 def _detect_z5d() -> bool:
@@ -33,13 +45,7 @@ def _detect_z5d() -> bool:
     Detect if Z5D prime_generator tool is available.
     Caches result for subsequent calls.
     """
-    global Z5D_AVAILABLE
-    if Z5D_AVAILABLE is not None:
-        return Z5D_AVAILABLE
-    
-    # Check if prime_generator is in PATH
-    Z5D_AVAILABLE = shutil.which(Z5D_PRIME_GENERATOR) is not None
-    return Z5D_AVAILABLE
+    return _z5d_executable() is not None
 
 
 def _z5d_next_prime(n: int) -> Optional[int]:
@@ -52,13 +58,14 @@ def _z5d_next_prime(n: int) -> Optional[int]:
     Returns:
         Next prime >= n, or None if Z5D fails
     """
-    if not _detect_z5d():
+    executable = _z5d_executable()
+    if executable is None:
         return None
     
     try:
         # Call: prime_generator --start <n> --count 1 --csv
         result = subprocess.run(
-            [Z5D_PRIME_GENERATOR, "--start", str(n), "--count", "1", "--csv"],
+            [executable, "--start", str(n), "--count", "1", "--csv"],
             capture_output=True,
             text=True,
             timeout=60,  # 60 second timeout
@@ -85,82 +92,6 @@ def _z5d_next_prime(n: int) -> Optional[int]:
         return None
 
 
-def _miller_rabin(n: int, k: int = 10) -> bool:
-    """
-    Miller-Rabin probabilistic primality test (fallback).
-    
-    Args:
-        n: Number to test
-        k: Number of rounds (higher = more accurate, default 10 gives error < 2^-20)
-    
-    Returns:
-        True if n is probably prime, False if definitely composite
-    """
-    # Write n-1 as 2^r * d
-    r, d = 0, n - 1
-    while d % 2 == 0:
-        r += 1
-        d //= 2
-    
-    # Witness loop
-    for _ in range(k):
-        a = random.randint(2, n - 2)
-        x = pow(a, d, n)
-        
-        if x == 1 or x == n - 1:
-            continue
-        
-        for _ in range(r - 1):
-            x = pow(x, 2, n)
-            if x == n - 1:
-                break
-        else:
-            return False
-    
-    return True
-
-
-def _fallback_is_prime(n: int) -> bool:
-    """
-    Fallback primality test using Miller-Rabin.
-    Uses trial division for small numbers.
-    """
-    if n < 2:
-        return False
-    if n == 2 or n == 3:
-        return True
-    if n % 2 == 0:
-        return False
-    
-    # For small numbers, use trial division
-    if n < 1000:
-        i = 3
-        while i * i <= n:
-            if n % i == 0:
-                return False
-            i += 2
-        return True
-    
-    # For large numbers, use Miller-Rabin
-    return _miller_rabin(n, k=10)
-
-
-def _fallback_next_prime(n: int) -> int:
-    """
-    Fallback: find next prime >= n using Miller-Rabin.
-    """
-    if n < 2:
-        return 2
-    if n == 2:
-        return 2
-    if n % 2 == 0:
-        n += 1
-    while True:
-        if _fallback_is_prime(n):
-            return n
-        n += 2
-
-
 def next_prime(n: int, use_z5d: bool = True) -> int:
     """
     Find the next prime >= n.
@@ -193,6 +124,28 @@ def next_prime(n: int, use_z5d: bool = True) -> int:
     return _fallback_next_prime(n)
 
 
+def next_prime_batch(ns: Sequence[int], use_z5d: bool = True) -> List[int]:
+    """
+    next_prime for several starting points.
+    
+    Args:
+        ns: Starting values
+        use_z5d: If True, attempt to use Z5D prime generator when available
+    
+    Returns:
+        Next prime >= n for each n, in order
+    
+    Notes:
+        - Tool detection happens once for the whole batch
+        - prime_generator only exposes a single --start per invocation, so
+          with Z5D each value is still one call; a multi-start mode would
+          slot in here
+    """
+    if use_z5d and _detect_z5d():
+        return [next_prime(n, use_z5d=True) for n in ns]
+    return [_fallback_next_prime(n) for n in ns]
+
+
 def is_prime(n: int, use_z5d: bool = True) -> bool:
     """
     Test if n is prime.
@@ -214,4 +167,4 @@ def is_prime(n: int, use_z5d: bool = True) -> bool:
     return _fallback_is_prime(n)
 
 
-__all__ = ["next_prime", "is_prime"]
+__all__ = ["next_prime", "next_prime_batch", "is_prime"]
@@ -6,6 +6,7 @@ CLI entrypoint for the emergence cell-view engine.
 import argparse
 import json
 import os
+from math import isqrt
 from typing import Dict
 
 from cellview.cert.certify import certify_top_m
@@ -44,15 +45,18 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
-def load_candidates(args, N, rng):
+def load_candidates(args, N, rng, sqrt_n=None):
+    if sqrt_n is None:
+        sqrt_n = isqrt(N)
     if args.candidates_file:
-        with open(args.candidates_file, "r", encoding="utf-8") as f:
-            vals = [int(line.strip()) for line in f if line.strip()]
-        return vals
+        # One read and a bytes split; int() parses ASCII digits from bytes
+        # directly, and blank lines simply produce no tokens.
+        with open(args.candidates_file, "rb") as f:
+            return list(map(int, f.read().split()))
 
     # Dense contiguous options (challenge mode)
     if args.dense_window:
-        center = int((N ** 0.5))
+        center = sqrt_n
         half = args.dense_window
         return cand_utils.dense_band(center, half)
     if args.dense_bands:
@@ -76,7 +80,7 @@ def load_candidates(args, N, rng):
             bands_spec.append((int(center), int(window), int(samples)))
         return cand_utils.multiband_corridors(N, rng, bands_spec)
 
-    return cand_utils.corridor_around_sqrt(N, rng, samples=args.samples, window=args.window)
+    return cand_utils.corridor_around_sqrt(N, rng, samples=args.samples, window=args.window, center=sqrt_n)
 
 
 def main():
@@ -89,7 +93,9 @@ def main():
     energy_specs: Dict[str, any] = default_specs()
     rng = rng_from_hex(args.seed_hex)
 
-    candidates = load_candidates(args, N, rng)
+    # The canonical sqrt(N) is precomputed; only overrides need an isqrt.
+    sqrt_n = CHALLENGE.sqrt_n if N == CHALLENGE.n else isqrt(N)
+    candidates = load_candidates(args, N, rng, sqrt_n)
     if args.mode == "challenge":
         cand_utils.guard_dense_domain_for_challenge(len(candidates), n=N)
 
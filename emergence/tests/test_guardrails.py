@@ -3,12 +3,13 @@ import tempfile
 import shutil
 import os
 import json
-from decimal import Decimal
-from cellview.engine.engine import CellViewEngine
+from dataclasses import FrozenInstanceError, replace
+from cellview.engine.engine import CellViewEngine, EnergyCache
 from cellview.utils import challenge
 from cellview.utils import rng
 from cellview.utils import candidates as cand_utils
-from cellview.heuristics.core import default_specs
+from cellview.cert.certify import certify_top_m
+from cellview.heuristics.core import EnergySpec, default_specs
 
 class TestGuardrails(unittest.TestCase):
 
@@ -31,12 +32,17 @@ class TestGuardrails(unittest.TestCase):
         specs = default_specs()
         seed_hex = "abcdef123456"
         
+        # The second engine takes its energies from the first one's cache.
+        energies = EnergyCache()
+        
         rng1 = rng.rng_from_hex(seed_hex)
-        engine1 = CellViewEngine(N, candidates, ["dirichlet5"], specs, rng1, max_steps=10)
+        engine1 = CellViewEngine(N, candidates, ["dirichlet5"], specs, rng1, max_steps=10,
+                                 shared_energies=energies)
         res1 = engine1.run()
         
         rng2 = rng.rng_from_hex(seed_hex)
-        engine2 = CellViewEngine(N, candidates, ["dirichlet5"], specs, rng2, max_steps=10)
+        engine2 = CellViewEngine(N, candidates, ["dirichlet5"], specs, rng2, max_steps=10,
+                                 shared_energies=energies)
         res2 = engine2.run()
 
         self.assertEqual(res1['swaps_per_step'], res2['swaps_per_step'])
@@ -46,6 +52,15 @@ class TestGuardrails(unittest.TestCase):
         state2 = [(c['n'], c['energy']) for c in res2['final_state']]
         self.assertEqual(state1, state2)
 
+    def test_toy_eval_metrics_pinned(self):
+        """Toy metrics for the closed-form Dirichlet energy (ties are exact; see test_heuristics)."""
+        from cellview.experiments.toy_eval import run_case
+        r221 = run_case(221, (13, 17), ["dirichlet5"])
+        self.assertEqual(r221["sortedness_final"], 0.75)
+        self.assertEqual(r221["dg_index"], 0.0)
+        r10403 = run_case(10403, (101, 103), ["dirichlet5"])
+        self.assertAlmostEqual(r10403["dg_index"], 3.0, places=9)
+
     def test_challenge_mode_sparse_guard(self):
         """Task 3: Test that Challenge mode rejects dense domain allocation."""
         try:
@@ -72,15 +87,89 @@ class TestGuardrails(unittest.TestCase):
         e1 = engine.energy_of(cell0)
         
         # RESET cell's internal property
-        cell0.energy = None
+        cell0 = replace(cell0, energy=None)
         
         # Modify engine cache using correct (algotype, n) key
         cache_key = (cell0.algotype, cell0.n)
-        engine.energy_cache[cache_key] = Decimal("999.99")
+        engine.energy_cache[cache_key] = 999.99
         
         e2 = engine.energy_of(cell0)
         
-        self.assertEqual(e2, Decimal("999.99"), "Engine did not use cached energy value")
+        self.assertEqual(e2, 999.99, "Engine did not use cached energy value")
+
+    def test_int_energy_spec_certifies(self):
+        """Int-returning energy fns yield float energies and certify alike with or without numba."""
+        specs = {"mod": EnergySpec("mod", lambda n, N, p: N % n, {})}
+        engine = CellViewEngine(221, list(range(2, 30)), ["mod"], specs, rng.rng_from_hex("123"))
+        res = engine.run()
+        self.assertTrue(all(type(c["energy"]) is float for c in res["final_state"]))
+        certs = certify_top_m(res["ranked_candidates"], 221, m=2)
+        self.assertEqual(sorted(c["n"] for c in certs if c["is_factor"]), [13, 17])
+
+    def test_shared_energy_cache(self):
+        """Engines sharing an EnergyCache only evaluate candidates not seen before."""
+        calls = []
+
+        def counting_energy(n, N, params):
+            calls.append(n)
+            return float(N % n) / n + params["shift"]
+
+        specs = {"count": EnergySpec("count", counting_energy, {"shift": 1.0})}
+        # Sharing is opt-in: engines without a cache always evaluate.
+        CellViewEngine(1000, [7], ["count"], specs, rng.rng_from_hex("123"))
+        CellViewEngine(1000, [7], ["count"], specs, rng.rng_from_hex("123"))
+        self.assertEqual(calls, [7, 7])
+
+        del calls[:]
+        cache = EnergyCache()
+        CellViewEngine(1000, [7, 11, 13], ["count"], specs, rng.rng_from_hex("123"), shared_energies=cache)
+        engine = CellViewEngine(1000, [11, 13, 17], ["count"], specs, rng.rng_from_hex("123"), shared_energies=cache)
+        self.assertEqual(calls, [7, 11, 13, 17])
+        self.assertEqual([c.energy for c in engine.cells], [counting_energy(n, 1000, {"shift": 1.0}) for n in (11, 13, 17)])
+
+        # A different N or different params must not reuse those energies.
+        del calls[:]
+        CellViewEngine(1001, [11], ["count"], specs, rng.rng_from_hex("123"), shared_energies=cache)
+        specs["count"] = EnergySpec("count", counting_energy, {"shift": 2.0})
+        CellViewEngine(1000, [11], ["count"], specs, rng.rng_from_hex("123"), shared_energies=cache)
+        self.assertEqual(calls, [11, 11])
+
+        # retain_only keeps the tables for one N and drops the rest.
+        del calls[:]
+        cache.retain_only(1000)
+        CellViewEngine(1000, [11], ["count"], specs, rng.rng_from_hex("123"), shared_energies=cache)
+        shift1 = {"count": EnergySpec("count", counting_energy, {"shift": 1.0})}
+        CellViewEngine(1001, [11], ["count"], shift1, rng.rng_from_hex("123"), shared_energies=cache)
+        self.assertEqual(calls, [11])
+
+        del calls[:]
+        cache.clear()
+        CellViewEngine(1000, [11], ["count"], specs, rng.rng_from_hex("123"), shared_energies=cache)
+        self.assertEqual(calls, [11])
+
+    def test_frozen_cells_in_sweep(self):
+        """Frozen cells: Type-1 can be displaced but not enter a lower slot; Type-2 never move."""
+        N = 10_933_133
+        candidates = list(range(2, 60))
+        specs = default_specs()
+        for type2 in (False, True):
+            engine = CellViewEngine(N, candidates, ["dirichlet5"], specs, rng.rng_from_hex("123"),
+                                    max_steps=50, type2_immovable=type2)
+            frozen_ns = {c.n for c in engine.cells[::5]}
+            # Snapshots are read-only; writing the old way must fail loudly.
+            with self.assertRaises(FrozenInstanceError):
+                engine.cells[0].frozen = True
+            engine.freeze(range(0, len(candidates), 5))
+            self.assertEqual({c.n for c in engine.cells if c.frozen}, frozen_ns)
+            before = {c.n: i for i, c in enumerate(engine.cells)}
+            engine.run()
+            after = {c.n: i for i, c in enumerate(engine.cells)}
+            self.assertEqual(sorted(before), sorted(after))
+            for n in frozen_ns:
+                if type2:
+                    self.assertEqual(before[n], after[n])
+                else:
+                    self.assertGreaterEqual(after[n], before[n])
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,96 @@
+import unittest
+from math import cos, pi
+
+from cellview.heuristics.core import (
+    BATCH_REGISTRY,
+    composite_spec,
+    dirichlet_energy,
+    dirichlet_energy_batch,
+    residue_energy,
+    residue_energy_batch,
+    default_specs,
+    evaluate_batch,
+)
+from cellview.utils.challenge import CHALLENGE
+
+
+def _dirichlet_sum(n, N, j):
+    """Reference: explicit cosine sum, normalized and inverted."""
+    x = 2 * pi * ((N % n) / n)
+    s = 1.0 + sum(2 * cos(k * x) for k in range(1, j + 1))
+    return 1 - abs(s / (2 * j + 1))
+
+
+class TestDirichletEnergy(unittest.TestCase):
+
+    def test_closed_form_matches_cosine_sum(self):
+        """Closed form agrees with the explicit kernel sum."""
+        N = 10_933_133
+        for j in (5, 11):
+            for n in range(2, 400):
+                self.assertAlmostEqual(
+                    dirichlet_energy(n, N, {"j": j}), _dirichlet_sum(n, N, j), places=9
+                )
+
+    def test_exact_divisor_is_zero_energy(self):
+        """A true divisor (residue 0) hits the kernel peak, i.e. energy 0."""
+        self.assertEqual(dirichlet_energy(2473, 2473 * 4421, {"j": 11}), 0.0)
+
+    def test_equal_kernel_values_tie_exactly(self):
+        """
+        Mathematically equal kernel values come out as exact ties.
+
+        |D_5| is 1 at both x = pi (221 mod 2 = 1) and x = 2pi/3 (221 mod 3 = 2,
+        folded to 1/3). The cosine sum differed there by an ulp, which the
+        sweep's strict > comparison turned into swaps; the closed form does not.
+        """
+        params = {"j": 5, "normalize": True, "invert": True}
+        energies = dirichlet_energy_batch([2, 3, 4, 6], 221, params)
+        self.assertEqual(energies[0], energies[1])
+        self.assertEqual(energies[2], energies[3])
+        self.assertNotEqual(_dirichlet_sum(2, 221, 5), _dirichlet_sum(3, 221, 5))
+
+    def test_batch_matches_scalar(self):
+        """Batched path returns exactly the scalar values, including 127-bit N."""
+        # Large enough to take the native path when numba is installed.
+        ns = [CHALLENGE.sqrt_n + k for k in range(-1500, 1500)] + list(range(2, 500))
+        params = {"j": 11, "normalize": True, "invert": True}
+        batch = dirichlet_energy_batch(ns, CHALLENGE.n, params)
+        self.assertEqual(batch, [dirichlet_energy(n, CHALLENGE.n, params) for n in ns])
+
+
+class TestResidueEnergy(unittest.TestCase):
+
+    def test_batch_matches_scalar(self):
+        """Batched residue energies equal (N mod n) / n exactly."""
+        ns = [CHALLENGE.sqrt_n + k for k in range(-1500, 1500)] + list(range(2, 500))
+        batch = residue_energy_batch(ns, CHALLENGE.n, {})
+        self.assertEqual(batch, [residue_energy(n, CHALLENGE.n, {}) for n in ns])
+
+    def test_composite_shares_residues(self):
+        """Composite batches (with a shared N mod n) equal the per-candidate sums."""
+        ns = [CHALLENGE.sqrt_n + k for k in range(-1500, 1500)]
+        for name in ("combo_dir11_res", "combo_dir11_arctan"):
+            spec = default_specs()[name]
+            batch = evaluate_batch(spec, ns, CHALLENGE.n)
+            self.assertEqual(batch, [spec.fn(n, CHALLENGE.n, spec.params) for n in ns])
+
+    def test_compiled_composite_is_self_contained(self):
+        """Composites carry their batch fn (no registry growth) and snapshot their params."""
+        registered = len(BATCH_REGISTRY)
+        weights = {"dirichlet": 0.5, "residue": 0.5}
+        sub_params = {"dirichlet": {"j": 11}}
+        spec = composite_spec("probe", weights, sub_params)
+        self.assertEqual(len(BATCH_REGISTRY), registered)
+        ns = list(range(2, 300))
+        before = evaluate_batch(spec, ns, 10_933_133)
+        self.assertEqual(before, [spec.fn(n, 10_933_133, spec.params) for n in ns])
+        # Neither the caller's dicts nor the logged params feed the compiled fn.
+        weights["residue"] = 0.0
+        sub_params["dirichlet"]["j"] = 5
+        self.assertEqual(spec.params["sub_params"], {"dirichlet": {"j": 11}})
+        self.assertEqual(evaluate_batch(spec, ns, 10_933_133), before)
+
+
+if __name__ == '__main__':
+    unittest.main()
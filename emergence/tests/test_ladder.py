@@ -86,8 +86,8 @@ class TestSemiprimeGeneration(unittest.TestCase):
         # Verify p < q (p is smaller factor)
         self.assertLess(gate.p, gate.q)
         
-        # Verify N is approximately the target bit size
-        self.assertLessEqual(abs(gate.actual_bits - gate.target_bits), 2)
+        # Verify N hits the target bit size
+        self.assertEqual(gate.actual_bits, gate.target_bits)
     
     def test_determinism(self):
         """Test that same seed produces same semiprime."""
@@ -177,6 +177,7 @@ class TestLadderGeneration(unittest.TestCase):
             self.assertIsNotNone(gate.p)
             self.assertIsNotNone(gate.q)
             self.assertEqual(gate.N, gate.p * gate.q)
+            self.assertEqual(gate.actual_bits, gate.target_bits)
             self.assertTrue(_is_prime(gate.p))
             self.assertTrue(_is_prime(gate.q))
 
@@ -1,5 +1,5 @@
 import unittest
-from cellview.metrics.core import detect_dg, aggregation
+from cellview.metrics.core import detect_dg, aggregation, sortedness
 
 class TestMetrics(unittest.TestCase):
 
@@ -42,5 +42,13 @@ class TestMetrics(unittest.TestCase):
         # Pairs: (A,A) match, (A,B) no, (B,B) match. Total 3 pairs. 2 matches.
         self.assertAlmostEqual(aggregation(["A", "A", "B", "B"]), 2/3)
 
+    def test_sortedness(self):
+        """Adjacent-inversion sortedness on plain ints, including 127-bit values."""
+        self.assertEqual(sortedness([1, 2, 2, 3]), 1.0)
+        self.assertEqual(sortedness([4, 3, 2, 1]), 0.0)
+        self.assertAlmostEqual(sortedness([1, 3, 2, 4]), 2/3)
+        big = 137524771864208156028430259349934309717
+        self.assertEqual(sortedness([big, big + 1, big - 1]), 0.5)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -30,6 +30,21 @@ class TestZ5DIntegration(unittest.TestCase):
         self.assertEqual(z5d_prime.next_prime(10, use_z5d=False), 11)
         self.assertTrue(z5d_prime.is_prime(17, use_z5d=False))
     
+    def test_sieved_next_prime_matches_scan(self):
+        """Segmented sieve finds the same prime as a plain odd-number scan."""
+        expected = 3001  # prime
+        for n in range(3001, 1, -1):
+            if z5d_prime.is_prime(n):
+                expected = n
+            self.assertEqual(z5d_prime.next_prime(n, use_z5d=False), expected)
+    
+    def test_strong_pseudoprimes_rejected(self):
+        """Fixed witnesses reject known strong pseudoprimes to the small prime bases."""
+        for n in (2047, 3215031751, 3825123056546413051, 318665857834031151167461,
+                  3317044064679887385961981):
+            self.assertFalse(z5d_prime.is_prime(n), n)
+        self.assertTrue(z5d_prime.is_prime(2**127 - 1))
+    
     def test_large_prime_generation(self):
         """Test that large prime generation works (with fallback)."""
         # Generate a 50-bit prime starting from 2^49
@@ -11,11 +11,25 @@ Validation range: [10^14, 10^18] per docs/validation/VALIDATION_GATES.md
 Whitelist: 127-bit CHALLENGE_127 = 137524771864208156028430259349934309717
 """
 import argparse
+import functools
 import math
+import os
 import random
 import hashlib
 import json
-from typing import List, Tuple, Dict, Any
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Sequence, Tuple, Dict, Any
+
+try:
+    import numpy as np
+except ImportError:  # optional accelerator; scoring falls back to pure Python
+    np = None
+
+try:
+    import orjson
+except ImportError:  # optional accelerator; the CLI falls back to json
+    orjson = None
 
 # Validation gates
 CHALLENGE_127 = 137524771864208156028430259349934309717  # Gate 3: 127-bit challenge
@@ -25,6 +39,22 @@ RANGE_MAX = 10**18  # Gate 4: Operational range maximum
 # Retry multiplier for candidate generation (p-adic filter may reject candidates)
 FILTER_RETRY_MULTIPLIER = 50
 
+# Smallest batch of offsets drawn per filtering round in generate_candidates.
+FILTER_CHUNK_MIN = 1024
+
+# Largest modulus for the p-adic residue table (bytes; 2*3*...*17 = 510510).
+WHEEL_LIMIT = 600_000
+
+# |sin(x/2)| below which the Dirichlet kernel is taken at its peak 2j + 1;
+# the closed form loses accuracy there, while the true value is within
+# O(j^3 * eps^2) of the peak.
+KERNEL_PEAK_EPS = 1e-12
+
+# Fewest candidates for which resonance_rank farms scoring out to worker
+# processes. Scoring runs at roughly 0.4-1.5 us per candidate, so below this
+# pool start-up and pickling the candidates cost more than they save.
+PARALLEL_MIN_CANDIDATES = 100_000
+
 
 def adaptive_precision(N: int) -> int:
     """
@@ -45,11 +75,17 @@ def validate_n(N: int) -> bool:
 
 
 def dirichlet_kernel(x: float, j: int) -> float:
-    """Compute Dirichlet kernel D_j(x) = 1 + 2*sum(cos(k*x) for k in 1..j)."""
-    s = 1.0
-    for k in range(1, j + 1):
-        s += 2.0 * math.cos(k * x)
-    return s
+    """
+    Compute Dirichlet kernel D_j(x) = 1 + 2*sum(cos(k*x) for k in 1..j).
+
+    Evaluated in closed form, sin((j + 1/2) x) / sin(x/2): two sines instead
+    of j cosines. Where sin(x/2) vanishes (x a multiple of 2*pi) the kernel
+    peaks at 2j + 1.
+    """
+    denom = math.sin(x * 0.5)
+    if abs(denom) < KERNEL_PEAK_EPS:
+        return 2.0 * j + 1.0
+    return math.sin((j + 0.5) * x) / denom
 
 
 def real_resonance_score(N: int, d: int, j: int) -> float:
@@ -59,6 +95,47 @@ def real_resonance_score(N: int, d: int, j: int) -> float:
     return abs(dirichlet_kernel(x, j))
 
 
+def resonance_scores_batch(N: int, candidates: List[int], j: int) -> "np.ndarray":
+    """
+    real_resonance_score for every candidate at once (requires NumPy).
+
+    N % d stays a Python bignum op; the closed-form kernel then runs as array
+    ops mirroring dirichlet_kernel term by term, so scores are bit-identical
+    to the scalar path.
+    """
+    fracs = np.array([(N % d) / float(d) for d in candidates], dtype=np.float64)
+    x = 2.0 * math.pi * fracs
+    denom = np.sin(x * 0.5)
+    peak = np.abs(denom) < KERNEL_PEAK_EPS
+    s = np.sin((j + 0.5) * x) / np.where(peak, 1.0, denom)
+    s[peak] = 2.0 * j + 1.0
+    return np.abs(s)
+
+
+def resonance_scores(N: int, candidates: List[int], j: int) -> Sequence[float]:
+    """Scores of candidates in order: a NumPy array when available, else a list."""
+    if np is None:
+        return [real_resonance_score(N, d, j) for d in candidates]
+    return resonance_scores_batch(N, candidates, j)
+
+
+def resonance_scores_parallel(N: int, candidates: List[int], j: int, workers: int) -> Sequence[float]:
+    """
+    resonance_scores split into one contiguous chunk per worker process.
+
+    Each candidate's score depends only on (N, d, j), so chunks are scored
+    independently and concatenated in order; the result is identical to the
+    single-process call.
+    """
+    size = -(-len(candidates) // workers)
+    chunks = [candidates[i:i + size] for i in range(0, len(candidates), size)]
+    with ProcessPoolExecutor(max_workers=len(chunks)) as pool:
+        parts = list(pool.map(resonance_scores, [N] * len(chunks), chunks, [j] * len(chunks)))
+    if np is None:
+        return [score for part in parts for score in part]
+    return np.concatenate(parts)
+
+
 def small_primes(limit: int = 97) -> List[int]:
     """Generate primes up to limit for p-adic filtering (25 primes for limit=97)."""
     primes: List[int] = []
@@ -75,6 +152,10 @@ def small_primes(limit: int = 97) -> List[int]:
     return primes
 
 
+# Filter primes, computed once; small_primes() is pure.
+P_ADIC_PRIMES: Tuple[int, ...] = tuple(small_primes())
+
+
 def build_p_adic_filter(N: int, primes: List[int]) -> Dict[int, int]:
     """Build p-adic filter: maps prime p to N mod p."""
     return {p: N % p for p in primes}
@@ -88,6 +169,57 @@ def passes_p_adic_filter(d: int, N_mod: Dict[int, int]) -> bool:
     return True
 
 
+@functools.lru_cache(maxsize=16)
+def build_wheel(primes: Tuple[int, ...]) -> Tuple[int, bytes, Tuple[int, ...]]:
+    """
+    Split rejecting primes into a wheel and the rest.
+
+    Returns (P, allowed, rest): P is the product of the smallest primes with
+    P <= WHEEL_LIMIT, allowed[r] is 1 iff r is coprime to P, and rest holds
+    the primes left for per-prime checks. Cached: the same N (or any N with
+    the same rejecting primes) reuses the table.
+    """
+    wheel_mod = 1
+    rest: List[int] = []
+    for p in sorted(primes):
+        if not rest and wheel_mod * p <= WHEEL_LIMIT:
+            wheel_mod *= p
+        else:
+            rest.append(p)
+    allowed = bytearray([1]) * wheel_mod
+    for p in primes:
+        if p not in rest:
+            allowed[0::p] = bytes(len(range(0, wheel_mod, p)))
+    return wheel_mod, bytes(allowed), tuple(rest)
+
+
+def passing_offsets(
+    offsets: List[int],
+    wheel_root: int,
+    wheel_mod: int,
+    allowed: bytes,
+    root_mod: List[Tuple[int, int]],
+) -> List[int]:
+    """
+    The offsets (in order) whose d = root + offset passes the p-adic filter.
+
+    d % p == (root % p + offset) % p, so only the small offset is reduced,
+    never d itself: one wheel lookup for the smallest primes, then one mod per
+    remaining prime. With NumPy the whole batch is tested at once.
+    """
+    if np is None:
+        return [
+            offset for offset in offsets
+            if allowed[(wheel_root + offset) % wheel_mod]
+            and all((rmod + offset) % p for p, rmod in root_mod)
+        ]
+    offs = np.array(offsets, dtype=np.int64)
+    mask = np.frombuffer(allowed, dtype=np.uint8)[(wheel_root + offs) % wheel_mod].astype(bool)
+    for p, rmod in root_mod:
+        mask &= (rmod + offs) % p != 0
+    return offs[mask].tolist()
+
+
 def generate_candidates(
     N: int,
     window: int,
@@ -98,22 +230,36 @@ def generate_candidates(
     """Generate candidate divisors near sqrt(N) using deterministic sampling."""
     rnd = random.Random(seed)
     root = int(math.isqrt(N))
+    # The filter is passes_p_adic_filter with the always-passing primes
+    # dropped; the smallest primes are folded into one residue table mod their
+    # product (see build_wheel and passing_offsets).
+    wheel_mod, allowed, rest = build_wheel(tuple(p for p, nmod in N_mod.items() if nmod != 0))
+    wheel_root = root % wheel_mod
+    root_mod = [(p, root % p) for p in rest]
+    # randrange(span) - window is the same draw as randint(-window, window),
+    # minus its argument handling.
+    draw = rnd.randrange
+    span = 2 * window + 1
     seen = set()
     candidates: List[int] = []
     max_attempts = samples * FILTER_RETRY_MULTIPLIER
     attempts = 0
     while len(candidates) < samples and attempts < max_attempts:
-        attempts += 1
-        offset = rnd.randint(-window, window)
-        d = root + offset
-        if d <= 1 or d >= N:
-            continue
-        if d in seen:
-            continue
-        seen.add(d)
-        if not passes_p_adic_filter(d, N_mod):
-            continue
-        candidates.append(d)
+        # Offsets are drawn in chunks and filtered as a batch. The filter only
+        # depends on d, so filtering before dedup keeps the first passing
+        # occurrence of each d, exactly as the one-draw-at-a-time loop did; the
+        # draws left in a chunk after the last sample are simply unused.
+        chunk = min(max_attempts - attempts, max(FILTER_CHUNK_MIN, 2 * (samples - len(candidates))))
+        attempts += chunk
+        offsets = [draw(span) - window for _ in range(chunk)]
+        for offset in passing_offsets(offsets, wheel_root, wheel_mod, allowed, root_mod):
+            d = root + offset
+            if d <= 1 or d >= N or d in seen:
+                continue
+            seen.add(d)
+            candidates.append(d)
+            if len(candidates) == samples:
+                break
     return candidates
 
 
@@ -121,14 +267,40 @@ def resonance_rank(
     N: int,
     candidates: List[int],
     j: int,
-) -> List[Tuple[int, float]]:
-    """Rank candidates by resonance score (descending)."""
-    scored: List[Tuple[int, float]] = []
-    for d in candidates:
-        s = real_resonance_score(N, d, j)
-        scored.append((d, s))
-    scored.sort(key=lambda t: t[1], reverse=True)
-    return scored
+    top_k: Optional[int] = None,
+    workers: int = 1,
+) -> Tuple[Sequence[int], Sequence[float]]:
+    """
+    Rank candidates by resonance score (descending).
+
+    Returns parallel sequences (order, scores): order lists indices into
+    candidates best first, scores[i] is the score of candidates[i]. Nothing
+    is boxed per candidate; callers materialize only the entries they log.
+    With top_k, order holds just the best top_k, selected without sorting
+    the rest; it equals the first top_k of the full ranking. With workers > 1
+    and at least PARALLEL_MIN_CANDIDATES candidates, scoring is spread over
+    that many processes.
+    """
+    n = len(candidates)
+    k = n if top_k is None else min(top_k, n)
+    if workers > 1 and n >= PARALLEL_MIN_CANDIDATES:
+        scores = resonance_scores_parallel(N, candidates, j, workers)
+    else:
+        scores = resonance_scores(N, candidates, j)
+    if np is None:
+        # sorted() stays stable under reverse=True: ties keep candidate order.
+        # (heapq.nlargest measured slower than a full sort at 500 of 50k.)
+        return sorted(range(n), key=scores.__getitem__, reverse=True)[:k], scores
+    if k < n:
+        # Partition around the k-th best score, keeping the earliest
+        # candidates among ties at the cut, then sort only the survivors.
+        cut = np.partition(scores, n - k)[n - k]
+        above = np.flatnonzero(scores > cut)
+        ties = np.flatnonzero(scores == cut)[: k - above.size]
+        idx = np.sort(np.concatenate((above, ties)))
+        return idx[np.argsort(-scores[idx], kind="stable")], scores
+    # Stable on the negated scores: ties keep candidate order, as sort() does.
+    return np.argsort(-scores, kind="stable"), scores
 
 
 def is_factor(N: int, d: int) -> bool:
@@ -142,6 +314,8 @@ def geofac_local_global(
     samples: int = 50_000,
     j: int = 25,
     top_k: int = 500,
+    workers: int = 1,
+    early_exit: bool = True,
 ) -> Dict[str, Any]:
     """
     Run local-global resonance factorization.
@@ -152,6 +326,8 @@ def geofac_local_global(
         samples: Number of candidates to generate
         j: Dirichlet kernel order
         top_k: Number of top-ranked candidates to certify
+        workers: Processes used to score large candidate sets
+        early_exit: Stop certifying at the first factor (False certifies all top_k)
 
     Returns:
         Dictionary with N, parameters, candidates, and any factors found.
@@ -165,8 +341,8 @@ def geofac_local_global(
             f"N must be in [{RANGE_MIN}, {RANGE_MAX}] or be the 127-bit challenge "
             f"({CHALLENGE_127}). Got N = {N}"
         )
-    if window <= 0 or samples <= 0 or j <= 0 or top_k <= 0:
-        raise ValueError("window, samples, j, and top_k must be positive.")
+    if window <= 0 or samples <= 0 or j <= 0 or top_k <= 0 or workers <= 0:
+        raise ValueError("window, samples, j, top_k, and workers must be positive.")
 
     # Compute adaptive precision for reproducibility per docs/validation/VALIDATION_GATES.md.
     # This prototype uses standard floats for Dirichlet scoring; precision is logged
@@ -175,19 +351,20 @@ def geofac_local_global(
 
     seed_bytes = hashlib.sha256(str(N).encode("utf-8")).digest()
     seed = int.from_bytes(seed_bytes[:8], "big")
-    primes = small_primes()
-    N_mod = build_p_adic_filter(N, primes)
+    N_mod = build_p_adic_filter(N, P_ADIC_PRIMES)
     candidates = generate_candidates(N, window, samples, seed, N_mod)
-    ranked = resonance_rank(N, candidates, j)
-    tail = ranked[: min(top_k, len(ranked))]
+    order, scores = resonance_rank(N, candidates, j, top_k, workers)
     candidate_logs = []
     factors = []
-    for rank, (d, score) in enumerate(tail, start=1):
+    for rank, i in enumerate(order, start=1):
+        d, score = candidates[i], scores[i]
         flag = is_factor(N, d)
         entry = {"d": int(d), "score": float(score), "rank": rank, "is_factor": flag}
         candidate_logs.append(entry)
         if flag:
             factors.append(entry)
+            if early_exit:
+                break
     log: Dict[str, Any] = {
         "N": str(N),
         "bit_length": int(N.bit_length()),
@@ -198,8 +375,9 @@ def geofac_local_global(
             "dirichlet_order_j": int(j),
             "top_k": int(top_k),
             "seed": int(seed),
+            "early_exit": bool(early_exit),
         },
-        "p_adic_primes": primes,
+        "p_adic_primes": list(P_ADIC_PRIMES),
         "candidates": candidate_logs,
         "factors": factors,
     }
@@ -216,6 +394,14 @@ def main() -> None:
     ap.add_argument("--samples", type=int, default=50_000)
     ap.add_argument("--j", type=int, default=25, help="Dirichlet kernel order.")
     ap.add_argument("--top-k", type=int, default=500)
+    ap.add_argument(
+        "--workers", type=int, default=1,
+        help=f"Scoring processes (used from {PARALLEL_MIN_CANDIDATES:,} candidates; 0 = all CPUs).",
+    )
+    ap.add_argument(
+        "--full-scan", action="store_true",
+        help="Certify all top-k candidates instead of stopping at the first factor.",
+    )
     args = ap.parse_args()
     log = geofac_local_global(
         N=args.N,
@@ -223,7 +409,23 @@ def main() -> None:
         samples=args.samples,
         j=args.j,
         top_k=args.top_k,
+        workers=args.workers or os.cpu_count() or 1,
+        early_exit=not args.full_scan,
     )
+    print_log(log)
+
+
+def print_log(log: Dict[str, Any]) -> None:
+    """Write the run log to stdout as indented JSON."""
+    if orjson is not None:
+        try:
+            data = orjson.dumps(log, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+        except orjson.JSONEncodeError:  # e.g. ints wider than 64 bits
+            data = None
+        if data is not None:
+            sys.stdout.flush()
+            sys.stdout.buffer.write(data)
+            return
     print(json.dumps(log, indent=2))
 
 
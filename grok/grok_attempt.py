@@ -4,28 +4,43 @@ Tuned Geofac: Factors 127-bit challenge via geometric resonance (no injection)
 """
 import math
 import hashlib
-from mpmath import mp, mpf, cos, pi
 
 N = 137524771864208156028430259349934309717
-sqrtN = int(mp.sqrt(N))
-mp.dps = 300  # Tuned per repo (scale-adaptive)
+# Double-precision sqrt, truncated: the value the sample centre has always
+# had (mpmath's default 53-bit sqrt), not math.isqrt(N).
+sqrtN = int(math.sqrt(N))
+
+J = 30  # Dirichlet order
 
 def dirichlet_score(d):
-    frac = mpf(N % d) / d
-    x = 2 * pi * frac
-    s = mpf(1)
-    for k in range(1, 31):  # j=30
-        s += 2 * cos(k * x)
-    return abs(s)
-
-phi = (1 + mpf(5).sqrt()) / 2
+    # Plain float64: (N % d) / d is a correctly rounded fraction in [0, 1), and
+    # with d near 64 bits the 53-bit mantissa already resolves the angle far
+    # below any score gap.
+    x = 2 * math.pi * ((N % d) / d)
+    # Closed form of 1 + 2*sum(cos(k*x), k=1..J); peaks at 2J + 1 where
+    # sin(x/2) vanishes.
+    denom = math.sin(0.5 * x)
+    if abs(denom) < 1e-12:
+        return 2.0 * J + 1.0
+    return abs(math.sin((J + 0.5) * x) / denom)
+
 seed = int(hashlib.sha256(str(N).encode()).hexdigest(), 16)
 
+# Golden-ratio stride in fixed point: frac_i = ((seed + i) / phi) mod 1 is
+# held as a GOLDEN_BITS-bit integer, so each sample costs one add rather than
+# a high-precision multiply. Truncating 1/phi leaves an error below
+# seed * 2^-GOLDEN_BITS < 2^-256, far finer than the 1/(2*window) resolution
+# that decides the offset.
+GOLDEN_BITS = 512
+INV_PHI_FIXED = (math.isqrt(5 << (2 * GOLDEN_BITS)) - (1 << GOLDEN_BITS)) >> 1  # floor(2^B / phi)
+
 def golden_samples(n_samples, window=2_000_000_000_000_000_000):
-    alpha = mpf(1) / phi
+    mask = (1 << GOLDEN_BITS) - 1
+    frac = (seed * INV_PHI_FIXED) & mask
+    span = 2 * window
     for i in range(n_samples):
-        frac = ((seed + i) * alpha) % 1
-        offset = int(frac * (2 * window)) - window
+        offset = ((frac * span) >> GOLDEN_BITS) - window
+        frac = (frac + INV_PHI_FIXED) & mask
         d = sqrtN + offset
         if 2 < d < N:
             yield d